@@ -0,0 +1,220 @@
+"""Benchmark every algorithm on every map and compare against a saved baseline
+
+Each run happens in a fresh process, one at a time, so timings do not compete
+for the CPU and memory_mb (peak RSS growth) is not hidden by earlier runs.
+
+Example (from src/):
+    python benchmark.py -n 5 -o ../benchmarks/current.json
+    python benchmark.py -n 5 --baseline ../benchmarks/baseline.json --threshold 0.2
+    python benchmark.py -a 'A*' Push --generate 20x20:6 30x30:8
+"""
+import os
+import sys
+import json
+import glob
+import math
+import time
+import platform
+import tempfile
+import argparse
+import statistics
+import multiprocessing
+import search_algorithms.runner as runner
+from search_algorithms.limits import Budget
+from search_algorithms.portfolio import OPTIMAL_ALGORITHMS
+from search_algorithms.generator import generate_map
+
+MAPS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'maps')
+
+# Increases no larger than these are noise on maps solved in a few milliseconds, never regressions
+MIN_TIME_DELTA_MS = 5
+MIN_MEMORY_DELTA_MB = 1
+
+# Portfolio runs the other solvers in parallel, its timings are not comparable with theirs, and it
+# cannot run at all here: the benchmark's pool workers are daemonic and may not start processes
+ALGORITHMS = [algorithm for algorithm in runner.ALGORITHMS if algorithm != 'Portfolio']
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the solvers over the bundled maps')
+    parser.add_argument('maps', nargs='*', help='map files to run (default: ../maps/input*.txt unless --generate is given)')
+    parser.add_argument('--generate', nargs='+', default=[], metavar='HxW:STONES',
+                        help='also run on generated maps, e.g. 20x20:6 (seeded, so the same spec always gives the same map)')
+    parser.add_argument('-a', '--algorithms', nargs='+', default=ALGORITHMS, choices=ALGORITHMS, metavar='ALGORITHM',
+                        help=f"algorithms to run (default: {', '.join(ALGORITHMS)})")
+    parser.add_argument('-n', '--repeat', type=int, default=5, help='runs per (map, algorithm) pair (default: 5)')
+    parser.add_argument('--time-limit', type=float, default=60, help='seconds before a run is stopped and counted as unsolved (default: 60)')
+    parser.add_argument('-o', '--output', default=None, help='JSON file to write the results to (default: stdout)')
+    parser.add_argument('--baseline', default=None, help='JSON file of an earlier run to compare against')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='relative increase in fastest time, nodes or median memory reported as a regression (default: 0.2)')
+    return parser.parse_args(argv)
+
+
+def percentile(values, fraction):
+    # Nearest-rank percentile, so the result is always one of the measured values
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def generate_maps(specs, directory):
+    """Write one generated map per HxW:STONES spec into directory and return their paths"""
+    paths = []
+    for spec in specs:
+        size, _, stones = spec.partition(':')
+        height, _, width = size.lower().partition('x')
+        height, width, stones = int(height), int(width or height), int(stones or 4)
+        path = os.path.join(directory, f'gen-{height}x{width}-{stones}.txt')
+        with open(path, 'w') as f:
+            f.write(generate_map(height, width, stones, seed=0))
+        paths.append(path)
+    return paths
+
+
+def run_once(map_file, algorithm, time_limit):
+    try:
+        result = runner.solve_file(map_file, algorithm, budget=Budget(time_limit=time_limit))
+    except Exception as error:
+        # Recorded as an unsolved run, the other runs and pairs are still measured
+        return {'solved': False, 'error': repr(error)}
+    if result is None:
+        return {'solved': False}
+    if result.get('stopped'):
+        return {'solved': False, 'stopped': result['stopped']}
+    return {
+        'solved': True,
+        'time_ms': float(result['time_ms']),
+        'memory_mb': float(result['memory_mb']),
+        'nodes': result['nodes'],
+        'steps': result['steps'],
+        'weight': result['weight'],
+        'optimal': result.get('optimal', True),
+    }
+
+
+def summarize(map_file, algorithm, runs):
+    """Aggregate the runs of one (map, algorithm) pair, None fields when no run solved the map"""
+    solved = [run for run in runs if run['solved']]
+    entry = {'map': os.path.basename(map_file), 'algorithm': algorithm, 'runs': len(runs), 'solved': len(solved)}
+    stopped = [run['stopped'] for run in runs if 'stopped' in run]
+    if stopped:
+        entry['stopped'] = stopped[0]
+    errors = [run['error'] for run in runs if 'error' in run]
+    if errors:
+        entry['error'] = errors[0]
+    if not solved:
+        entry.update({'time_ms': None, 'memory_mb': None, 'nodes': None, 'steps': None, 'weight': None})
+        return entry
+
+    for key in ('time_ms', 'memory_mb'):
+        values = [run[key] for run in solved]
+        entry[key] = {'min': round(min(values), 2), 'median': round(statistics.median(values), 2), 'p95': round(percentile(values, 0.95), 2)}
+    entry['nodes'] = statistics.median_low(run['nodes'] for run in solved)
+    # Solvers are deterministic, so steps and weight are the same for every run
+    entry['steps'] = solved[0]['steps']
+    entry['weight'] = solved[0]['weight']
+    # An anytime solver stopped by the time limit may return a solution it has not proven optimal
+    entry['optimal'] = all(run['optimal'] for run in solved)
+    return entry
+
+
+def compare(results, baseline, threshold):
+    """List the regressions of results against a baseline
+
+    Args:
+        results (list[dict]): entries returned by summarize
+        baseline (list[dict]): entries of an earlier run
+        threshold (float): relative increase tolerated in time, nodes and memory
+
+    Time is compared on the fastest run, the one least disturbed by the machine
+    (the median for baselines written before 'min' was recorded), memory on the
+    median. Time and memory increases within MIN_TIME_DELTA_MS and
+    MIN_MEMORY_DELTA_MB are ignored whatever their relative size.
+
+    Returns:
+        list[str]: one message per regression
+    """
+    previous = {(entry['map'], entry['algorithm']): entry for entry in baseline}
+    regressions = []
+    for entry in results:
+        name = f"{entry['map']} [{entry['algorithm']}]"
+        old = previous.get((entry['map'], entry['algorithm']))
+        if old is None or not old['solved']:
+            continue
+        if not entry['solved']:
+            regressions.append(f"{name}: no longer solved ({entry.get('error', entry.get('stopped', 'no solution'))})")
+            continue
+
+        optimal = entry['optimal'] and old.get('optimal', True)
+        if entry['algorithm'] in OPTIMAL_ALGORITHMS and optimal and entry['weight'] != old['weight']:
+            regressions.append(f"{name}: optimal weight changed from {old['weight']} to {entry['weight']}")
+
+        time_key = 'min' if 'min' in old['time_ms'] else 'median'
+        for key, new_value, old_value, floor in (
+            ('time_ms', entry['time_ms'][time_key], old['time_ms'][time_key], MIN_TIME_DELTA_MS),
+            ('memory_mb', entry['memory_mb']['median'], old['memory_mb']['median'], MIN_MEMORY_DELTA_MB),
+            ('nodes', entry['nodes'], old['nodes'], 0),
+        ):
+            if old_value > 0 and new_value > old_value * (1 + threshold) and new_value - old_value > floor:
+                regressions.append(f"{name}: {key} {old_value} -> {new_value} (+{100 * (new_value / old_value - 1):.0f}%)")
+    return regressions
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    maps = list(args.maps)
+    if not maps and not args.generate:
+        maps = sorted(glob.glob(os.path.join(MAPS_DIR, 'input*.txt')), key=lambda name: (len(name), name))
+
+    results = []
+    # A fresh process per run keeps peak RSS per run and avoids warm caches between repetitions
+    with tempfile.TemporaryDirectory() as generated, multiprocessing.get_context('spawn').Pool(1, maxtasksperchild=1) as pool:
+        maps += generate_maps(args.generate, generated)
+        for map_file in maps:
+            for algorithm in args.algorithms:
+                runs = []
+                for _ in range(args.repeat):
+                    try:
+                        runs.append(pool.apply(run_once, (map_file, algorithm, args.time_limit)))
+                    except Exception as error:
+                        # The worker itself failed, e.g. the result could not be sent back
+                        runs.append({'solved': False, 'error': repr(error)})
+                entry = summarize(map_file, algorithm, runs)
+                results.append(entry)
+                if entry['solved']:
+                    print(f"{entry['map']} [{algorithm}]: time_ms={entry['time_ms']['median']} (p95 {entry['time_ms']['p95']}) "
+                          f"nodes={entry['nodes']} weight={entry['weight']}", file=sys.stderr)
+                else:
+                    print(f"{entry['map']} [{algorithm}]: unsolved ({entry.get('error', entry.get('stopped', 'no solution'))})", file=sys.stderr)
+
+    report = {
+        'meta': {
+            'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'repeat': args.repeat,
+            'time_limit': args.time_limit,
+        },
+        'results': results,
+    }
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write('\n')
+
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)['results']
+        regressions = compare(results, baseline, args.threshold)
+        for message in regressions:
+            print(f'REGRESSION {message}', file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
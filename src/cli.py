@@ -0,0 +1,142 @@
+"""Headless solver: run every (map, algorithm) pair on a process pool
+
+Example (from src/):
+    python cli.py ../maps/input*.txt -a BFS UCS 'A*' -j 4
+    python cli.py ../maps/input1.txt --format jsonl -o results.jsonl
+"""
+import os
+import re
+import sys
+import json
+import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import search_algorithms.runner as runner
+from search_algorithms.limits import Budget
+from search_algorithms.metrics import METRICS
+from search_algorithms.cache import SolutionCache
+
+DEFAULT_OUTPUT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'output')
+DEFAULT_CACHE = os.path.join(DEFAULT_OUTPUT_DIR, 'solutions.sqlite3')
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Solve Ares' Adventure maps without the GUI")
+    parser.add_argument('maps', nargs='+', help='map files in the input format (weight line + grid)')
+    parser.add_argument('-a', '--algorithms', nargs='+', default=list(runner.ALGORITHMS), choices=list(runner.ALGORITHMS), metavar='ALGORITHM',
+                        help=f"algorithms to run (default: all of {', '.join(runner.ALGORITHMS)})")
+    parser.add_argument('-j', '--workers', type=int, default=os.cpu_count(), help='number of worker processes (default: CPU count)')
+    parser.add_argument('--format', choices=['text', 'jsonl'], default='text',
+                        help="'text' appends to output-NN.txt files like the GUI, 'jsonl' writes one JSON object per result")
+    parser.add_argument('-o', '--output', default=None,
+                        help="output directory for 'text' (default: ../output), output file for 'jsonl' (default: stdout)")
+    parser.add_argument('--time-limit', type=float, default=None, help='stop each search after this many seconds')
+    parser.add_argument('--max-expanded', type=int, default=None, help='stop each search after expanding this many nodes')
+    parser.add_argument('--max-stored', type=int, default=None, help='stop each search once it stores this many states')
+    parser.add_argument('--cache', default=DEFAULT_CACHE, help='solution cache shared with the GUI (default: ../output/solutions.sqlite3)')
+    parser.add_argument('--no-cache', action='store_true', help='always solve, neither reading nor filling the cache')
+    parser.add_argument('--profile', choices=list(METRICS), default='rss',
+                        help="'rss' reports the peak RSS growth with cheap counters, 'tracemalloc' traces Python allocations (slow)")
+    return parser.parse_args(argv)
+
+
+def output_file_name(map_file):
+    # ../maps/input3.txt -> output-03.txt, the name the GUI uses for map 3
+    stem = os.path.splitext(os.path.basename(map_file))[0]
+    match = re.fullmatch(r'input(\d+)', stem)
+    return f'output-{int(match.group(1)):02}.txt' if match else f'output-{stem}.txt'
+
+
+def write_text(output_dir, map_file, algorithm, result):
+    os.makedirs(output_dir, exist_ok=True)
+    with open(os.path.join(output_dir, output_file_name(map_file)), 'a+') as file:
+        runner.save_result_to_file(file, result, algorithm)
+
+
+def write_jsonl(stream, map_file, algorithm, result):
+    record = {'map': map_file, 'algorithm': algorithm, 'solved': result is not None and not result.get('stopped')}
+    record.update(result or {})
+    stream.write(json.dumps(record) + '\n')
+    stream.flush()
+
+
+def report(map_file, algorithm, result, args, stream):
+    cached = ' (cached)' if result and result.get('cached') else ''
+    if result is None:
+        print(f'{map_file} [{algorithm}]: no solution found', file=sys.stderr)
+    elif result.get('stopped'):
+        # An anytime solver stopped after a solution has one, not proven optimal and not written out
+        best = f" best weight={result['weight']} (not proven optimal)" if result.get('solutions') else ''
+        print(f"{map_file} [{algorithm}]: stopped ({result['stopped']}) after nodes={result['nodes']} "
+              f"time_ms={result['time_ms']}{best}", file=sys.stderr)
+    else:
+        print(f"{map_file} [{algorithm}]: steps={result['steps']} weight={result['weight']} "
+              f"nodes={result['nodes']} time_ms={result['time_ms']}{cached}", file=sys.stderr)
+
+    if args.format == 'jsonl':
+        write_jsonl(stream, map_file, algorithm, result)
+    elif result is not None and not result.get('stopped'):
+        write_text(args.output or DEFAULT_OUTPUT_DIR, map_file, algorithm, result)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    jobs = [(map_file, algorithm) for map_file in args.maps for algorithm in args.algorithms]
+    options = {'profile': args.profile}
+    if args.time_limit is not None or args.max_expanded is not None or args.max_stored is not None:
+        options['budget'] = Budget(args.time_limit, args.max_expanded, args.max_stored)
+
+    stream = None
+    if args.format == 'jsonl':
+        stream = open(args.output, 'a') if args.output else sys.stdout
+
+    cache = None
+    if not args.no_cache:
+        os.makedirs(os.path.dirname(os.path.abspath(args.cache)), exist_ok=True)
+        cache = SolutionCache(args.cache)
+
+    failures = 0
+    try:
+        # Cached results are reported right away, the rest are solved on the pool
+        keys = {}
+        for map_file, algorithm in jobs:
+            with open(map_file, 'r') as f:
+                keys[map_file, algorithm] = runner.result_key(f.read(), algorithm, **options)
+        cached = {job: cache.get(keys[job]) for job in jobs} if cache is not None else {}
+        for (map_file, algorithm), result in cached.items():
+            if result is not None:
+                result['cached'] = True
+                report(map_file, algorithm, result, args, stream)
+
+        # A fresh process per job keeps peak RSS per job, a reused worker would report 0 for a job below its earlier peaks.
+        # max_tasks_per_child needs Python 3.11, older interpreters reuse the workers
+        pool_options = {'max_workers': max(1, args.workers), 'mp_context': multiprocessing.get_context('spawn')}
+        if sys.version_info >= (3, 11):
+            pool_options['max_tasks_per_child'] = 1
+        with ProcessPoolExecutor(**pool_options) as pool:
+            futures = {pool.submit(runner.solve_file, map_file, algorithm, **options): (map_file, algorithm)
+                       for map_file, algorithm in jobs if cached.get((map_file, algorithm)) is None}
+            # Results are written from this process only, so output files and the cache are never written concurrently
+            for future in as_completed(futures):
+                map_file, algorithm = futures[future]
+                try:
+                    result = future.result()
+                except Exception as error:
+                    failures += 1
+                    print(f'{map_file} [{algorithm}]: failed ({error!r})', file=sys.stderr)
+                    continue
+
+                if cache is not None:
+                    cache.put(keys[map_file, algorithm], result)
+                report(map_file, algorithm, result, args, stream)
+    finally:
+        if cache is not None:
+            cache.close()
+        if stream is not None and stream is not sys.stdout:
+            stream.close()
+
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
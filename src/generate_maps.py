@@ -0,0 +1,51 @@
+"""Generate solvable maps for scaling tests
+
+Example (from src/):
+    python generate_maps.py ../maps/generated -n 5 --size 20x20 --stones 6 --seed 1
+    python cli.py ../maps/generated/*.txt -a 'A*' Push
+"""
+import os
+import sys
+import argparse
+from search_algorithms.generator import generate_map, DISTRIBUTIONS
+
+
+def parse_size(text):
+    height, _, width = text.lower().partition('x')
+    try:
+        return int(height), int(width or height)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected HEIGHTxWIDTH, got '{text}'")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Generate solvable maps by pulling stones away from their switches')
+    parser.add_argument('output', help='directory to write the maps to')
+    parser.add_argument('-n', '--count', type=int, default=1, help='number of maps (default: 1)')
+    parser.add_argument('--size', type=parse_size, default=(12, 12), help='HEIGHTxWIDTH including the outer walls (default: 12x12)')
+    parser.add_argument('--stones', type=int, default=4, help='stones per map (default: 4)')
+    parser.add_argument('--wall-density', type=float, default=0.2, help='chance of an inner wall (default: 0.2)')
+    parser.add_argument('--weights', type=int, nargs=2, default=(1, 99), metavar=('LOW', 'HIGH'), help='stone weight range (default: 1 99)')
+    parser.add_argument('--distribution', choices=list(DISTRIBUTIONS), default='uniform', help='stone weight distribution (default: uniform)')
+    parser.add_argument('--pulls', type=int, default=None, help='random pulls per map (default: stones * (height + width))')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the first map, the next ones use seed + 1, ... (default: 0)')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    height, width = args.size
+    os.makedirs(args.output, exist_ok=True)
+
+    for index in range(args.count):
+        seed = args.seed + index
+        text = generate_map(height, width, args.stones, args.wall_density, tuple(args.weights), args.distribution, args.pulls, seed)
+        path = os.path.join(args.output, f'gen-{height}x{width}-{args.stones}-{seed}.txt')
+        with open(path, 'w') as f:
+            f.write(text)
+        print(path)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,14 +1,20 @@
+import os
 import sys
-from PyQt5.QtWidgets import QApplication, QWidget, QComboBox, QPushButton, QLabel, QVBoxLayout, QHBoxLayout, QGridLayout, QMessageBox
+from PyQt5.QtWidgets import QApplication, QWidget, QComboBox, QPushButton, QLabel, QVBoxLayout, QHBoxLayout, QMessageBox, QSlider
 from PyQt5.QtGui import QIcon, QPixmap, QPainter, QColor, QMovie, QFont
-from PyQt5.QtCore import Qt, QTimer, QThread, pyqtSignal, QSize
+from PyQt5.QtCore import Qt, QTimer, QThread, pyqtSignal, QSize, QRect
 import search_algorithms._utils as _utils
-import search_algorithms.bfs as BFS
-import search_algorithms.dfs as DFS
-import search_algorithms.ucs as UCS
-import search_algorithms.a_star as ASTAR
+import search_algorithms.runner as runner
+from search_algorithms.limits import CancelToken
+from search_algorithms.cache import SolutionCache
+from playback import Playback
 from collections import deque
 
+# Playback speed in steps per second, 'Auto' plays the whole solution in about 5 seconds
+SPEEDS = {'Auto': None, '10 steps/s': 10, '50 steps/s': 50, '200 steps/s': 200, '1000 steps/s': 1000}
+# Shortest timer interval, faster speeds apply several moves per repaint instead
+FRAME_MS = 30
+
 def isInterger(s):
     try:
         int(s)
@@ -17,7 +23,10 @@ def isInterger(s):
         return False
 
 class AlgorithmThread(QThread):
-    finished = pyqtSignal(object)
+    # (result, algorithm), emitted from run() before the thread returns; QThread's own finished comes after
+    solved = pyqtSignal(object)
+    # Solutions of anytime algorithms, emitted while the search goes on improving them
+    improved = pyqtSignal(object)
 
     def __init__(self, algorithm, grid, ares_pos, stones, switches, stone_weights):
         super().__init__()
@@ -27,23 +36,154 @@ class AlgorithmThread(QThread):
         self.stones = stones
         self.switches = switches
         self.stone_weights = stone_weights
+        self.cancel_token = CancelToken()
+
+    def cancel(self):
+        self.cancel_token.cancel()
 
     def run(self):
         # Sleep for 1ms to allow the UI to update
         QThread.sleep(1)
         result = self.run_algorithm(self.algorithm)
-        self.finished.emit((result, self.algorithm))
+        self.solved.emit((result, self.algorithm))
 
     def run_algorithm(self, algorithm):
-        if algorithm == 'BFS':
-            return BFS.bfs(self.grid, self.ares_pos, self.stones, self.switches, self.stone_weights)
-        elif algorithm == 'DFS':
-            return DFS.dfs(self.grid, self.ares_pos, self.stones, self.switches, self.stone_weights)
-        elif algorithm == 'UCS':
-            return UCS.ucs(self.grid, self.ares_pos, self.stones, self.switches, self.stone_weights)
-        elif algorithm == 'A*':
-            return ASTAR.a_star(self.grid, self.ares_pos, self.stones, self.stone_weights, self.switches)
-        return None
+        if algorithm not in runner.ALGORITHMS:
+            return None
+        options = {'cancel': self.cancel_token}
+        if algorithm in runner.ANYTIME_ALGORITHMS:
+            options['on_solution'] = lambda result: self.improved.emit((result, algorithm))
+        return runner.solve(algorithm, self.grid, self.ares_pos, self.stones, self.switches, self.stone_weights, **options)
+
+class TileCache:
+    """Process-wide cache of the map tiles
+
+    Each source image is read and decoded once. Scaled tiles are memoized by
+    (image, size) and the weight-labelled stones by (weight, on switch, size),
+    so loading or resetting a map only looks pixmaps up.
+    """
+
+    def __init__(self, asset_dir='../asset'):
+        self.asset_dir = asset_dir
+        self.sources = {}
+        self.tiles = {}
+
+    def source(self, name):
+        if name not in self.sources:
+            self.sources[name] = QPixmap(f'{self.asset_dir}/{name}.png')
+        return self.sources[name]
+
+    def scaled(self, name, size):
+        key = (name, size)
+        if key not in self.tiles:
+            self.tiles[key] = self.source(name).scaled(size, size, Qt.KeepAspectRatio)
+        return self.tiles[key]
+
+    def on_floor(self, pixmap, size):
+        # Draw a transparent sprite over the floor tile
+        tile = QPixmap(size, size)
+        tile.fill(Qt.transparent)
+        painter = QPainter(tile)
+        painter.drawPixmap(0, 0, self.scaled('real_blank', size))
+        painter.drawPixmap(0, 0, pixmap)
+        painter.end()
+        return tile
+
+    def player(self, size):
+        key = ('player', size)
+        if key not in self.tiles:
+            self.tiles[key] = self.on_floor(self.scaled('ares', size), size)
+        return self.tiles[key]
+
+    def stone(self, weight, on_switch, size):
+        key = ('stone', weight, on_switch, size)
+        if key in self.tiles:
+            return self.tiles[key]
+
+        stone = QPixmap(self.scaled('stone', size))
+        if on_switch:
+            painter = QPainter(stone)
+            tint_color = QColor(255, 255, 0) # Yellow tint
+            tint_color.setAlpha(100)
+            painter.setCompositionMode(QPainter.CompositionMode_SourceAtop)
+            painter.fillRect(stone.rect(), tint_color)
+            painter.end()
+
+        tile = self.on_floor(stone, size)
+        weight_str = str(weight)
+        painter = QPainter(tile)
+        painter.setFont(QFont('../asset/JetBrainsMono-Regular.ttf', 16 * size // 40))
+        painter.setRenderHint(QPainter.TextAntialiasing)
+        painter.setPen(QColor(255, 255, 255))
+        text_rect = painter.boundingRect(tile.rect(), Qt.AlignRight, weight_str)
+        painter.drawText((size - text_rect.width()) // 2, (size + text_rect.height()) // 2, weight_str)
+        painter.end()
+        self.tiles[key] = tile
+        return tile
+
+    def assets(self, stone_weights, size=40):
+        """Pixmap of every grid symbol of a map
+
+        Args:
+            stone_weights (list[int]): weights of the map's stones
+            size (int): tile size in pixels
+
+        Returns:
+            dict[str, QPixmap]: '@'/'+' Ares, 'o' outside, '#' wall, ' ' floor, '.' switch,
+                str(weight) stone and str(-weight) stone on a switch
+        """
+        assets = {
+            '@': self.player(size),
+            '+': self.player(size),
+            'o': self.scaled('blank', size),
+            '#': self.scaled('brick', size),
+            ' ': self.scaled('real_blank', size),
+            '.': self.scaled('switch', size),
+        }
+        for weight in stone_weights:
+            assets[str(weight)] = self.stone(weight, False, size)
+            assets[str(-weight)] = self.stone(weight, True, size)
+        return assets
+
+# Pixmaps can only be created once the QApplication exists, so tiles are built on first use
+TILES = TileCache()
+
+class MapCanvas(QWidget):
+    """Paints the whole map in a single widget from the tile pixmaps
+
+    Cells are drawn from the grid symbols (see load_assets), so a move only has
+    to mark the cells it changed; Qt merges those into one repaint per frame.
+    """
+
+    def __init__(self, tile_size=40):
+        super().__init__()
+        self.tile_size = tile_size
+        self.grid = []
+        self.assets = {}
+
+    def set_map(self, grid, assets):
+        self.grid = grid
+        self.assets = assets
+        self.setFixedSize(len(grid[0]) * self.tile_size if grid else 0, len(grid) * self.tile_size)
+        self.update()
+
+    def update_cell(self, row, col):
+        self.update(QRect(col * self.tile_size, row * self.tile_size, self.tile_size, self.tile_size))
+
+    def paintEvent(self, event):
+        if not self.grid:
+            return
+        painter = QPainter(self)
+        rect = event.rect()
+        size = self.tile_size
+
+        # Only the cells intersecting the dirty rectangle are drawn
+        first_row, last_row = max(0, rect.top() // size), min(len(self.grid) - 1, rect.bottom() // size)
+        first_col, last_col = max(0, rect.left() // size), min(len(self.grid[0]) - 1, rect.right() // size)
+        for row in range(first_row, last_row + 1):
+            for col in range(first_col, last_col + 1):
+                painter.drawPixmap(col * size, row * size, self.assets[self.grid[row][col]])
+        painter.end()
 
 class SokobanVisualizer(QWidget):
     def __init__(self):
@@ -51,7 +191,17 @@ class SokobanVisualizer(QWidget):
         
         # Initialize UI Components
         self.maps = [f'../maps/input{i}.txt' for i in range(1, 11)]
+        self.map_texts = {}
         self.is_running = False
+        self.playback = None
+        # Better solution of an anytime search that arrived while another one was playing
+        self.pending = None
+        self.position = 0
+        self.search_thread = None
+        # Every search thread is kept referenced until it has returned, Qt aborts if a running QThread is destroyed
+        self.threads = []
+        os.makedirs('../output', exist_ok=True)
+        self.cache = SolutionCache('../output/solutions.sqlite3')
         self.initUI()
     
     def initUI(self):
@@ -74,7 +224,7 @@ class SokobanVisualizer(QWidget):
         
         # Algorithm Dropdown
         self.algorithm_dropdown = QComboBox()
-        self.algorithm_dropdown.addItems(['BFS', 'DFS', 'UCS', 'A*'])
+        self.algorithm_dropdown.addItems(list(runner.ALGORITHMS))
         top_layout.addWidget(QLabel('Select Algorithm:'))
         top_layout.addWidget(self.algorithm_dropdown)
         
@@ -82,6 +232,12 @@ class SokobanVisualizer(QWidget):
         self.steps_label = QLabel('Steps: 0')
         self.cost_label = QLabel('Total Cost: 0')
 
+        # Shown when the result was read from the solution cache
+        self.cached_label = QLabel('Cached')
+
+        # Best weight of an anytime search, while it improves and once it ends
+        self.refine_label = QLabel()
+
         # Loading Animation
         self.loading_label = QLabel()
         self.loading_movie = QMovie('../asset/loading.gif')
@@ -92,19 +248,20 @@ class SokobanVisualizer(QWidget):
         top_layout.addWidget(self.steps_label)
         top_layout.addWidget(self.cost_label)
         top_layout.addWidget(self.loading_label)
+        top_layout.addWidget(self.cached_label)
+        top_layout.addWidget(self.refine_label)
         self.loading_label.hide()
+        self.cached_label.hide()
+        self.refine_label.hide()
         self.steps_label.setFixedWidth(80)  # Increase width for steps label
         self.cost_label.setFixedWidth(100)  # Increase width for cost label
         
         # Add top layout to main layout
         main_layout.addLayout(top_layout)
         
-        # Grid Layout for Map
-        self.grid_layout = QGridLayout()
-        self.grid_layout.setSpacing(0)
-        self.map_container = QWidget()
-        self.map_container.setLayout(self.grid_layout)
-        main_layout.addWidget(self.map_container, alignment=Qt.AlignCenter)
+        # Canvas for Map
+        self.canvas = MapCanvas()
+        main_layout.addWidget(self.canvas, alignment=Qt.AlignCenter)
         
         # Bottom Controls Layout
         bottom_layout = QHBoxLayout()
@@ -119,6 +276,18 @@ class SokobanVisualizer(QWidget):
         self.reset_button.clicked.connect(self.reset_map)
         bottom_layout.addWidget(self.reset_button)
         
+        # Timeline Slider
+        self.timeline = QSlider(Qt.Horizontal)
+        self.timeline.setEnabled(False)
+        self.timeline.valueChanged.connect(self.seek)
+        bottom_layout.addWidget(self.timeline)
+        
+        # Speed Dropdown
+        self.speed_dropdown = QComboBox()
+        self.speed_dropdown.addItems(list(SPEEDS))
+        self.speed_dropdown.currentIndexChanged.connect(self.change_speed)
+        bottom_layout.addWidget(self.speed_dropdown)
+        
         # Add bottom layout to main layout
         main_layout.addLayout(bottom_layout)
         
@@ -133,81 +302,12 @@ class SokobanVisualizer(QWidget):
         self.load_map()
     
     def load_assets(self):
-        self.assets = {}
-        font = QFont('../asset/JetBrainsMono-Regular.ttf', 16)
-
-        # Load player assets on blank background
-        player_assets = QPixmap(40, 40)
-        player_assets.fill(Qt.transparent)
-        painter = QPainter(player_assets)
-        painter.drawPixmap(0, 0, QPixmap('../asset/real_blank.png').scaled(40, 40, Qt.KeepAspectRatio))
-        painter.drawPixmap(0, 0, QPixmap('../asset/ares.png').scaled(40, 40, Qt.KeepAspectRatio))
-        painter.end()
-        self.assets['@'] = player_assets
-        self.assets['+'] = player_assets
-
-        # Load other assets
-        self.assets['o'] = QPixmap('../asset/blank.png').scaled(40, 40, Qt.KeepAspectRatio)
-        self.assets['#'] = QPixmap('../asset/brick.png').scaled(40, 40, Qt.KeepAspectRatio)
-        self.assets[' '] = QPixmap('../asset/real_blank.png').scaled(40, 40, Qt.KeepAspectRatio)
-        self.assets['.'] = QPixmap('../asset/switch.png').scaled(40, 40, Qt.KeepAspectRatio)
-
-        # Load stone assets
-        original_stone = QPixmap('../asset/stone.png').scaled(40, 40, Qt.KeepAspectRatio)
-        stone_assets = QPixmap(40, 40)
-        stone_assets.fill(Qt.transparent)
-        painter = QPainter(stone_assets)
-        painter.drawPixmap(0, 0, QPixmap('../asset/real_blank.png').scaled(40, 40, Qt.KeepAspectRatio))
-        painter.drawPixmap(0, 0, original_stone)
-        painter.end()
-        # self.assets['$'] = stone_assets
-
-        for weight in self.stone_weights:
-            weight_str = str(weight)
-            pixmap = QPixmap(40, 40)
-            pixmap.fill(Qt.transparent)
-            painter = QPainter(pixmap)
-            painter.drawPixmap(0, 0, stone_assets)
-            painter.setFont(font)
-            painter.setRenderHint(QPainter.TextAntialiasing)
-            painter.setPen(QColor(255, 255, 255))
-            text_rect = painter.boundingRect(pixmap.rect(), Qt.AlignRight, weight_str)
-            painter.drawText((40 - text_rect.width()) // 2, (40 + text_rect.height()) // 2, weight_str)
-            painter.end()
-            self.assets[weight_str] = pixmap
-
-        # Load stone on switch assets
-        stone_on_switch = QPixmap(40, 40)
-        stone_on_switch.fill(Qt.transparent)
-        painter = QPainter(original_stone)
-        tint_color = QColor(255, 255, 0) # Yellow tint
-        tint_color.setAlpha(100)
-        painter.setCompositionMode(QPainter.CompositionMode_SourceAtop)
-        painter.fillRect(original_stone.rect(), tint_color)
-        painter.setCompositionMode(QPainter.CompositionMode_SourceOver)
-        painter.end()
-        painter = QPainter(stone_on_switch)
-        painter.drawPixmap(0, 0, QPixmap('../asset/real_blank.png').scaled(40, 40, Qt.KeepAspectRatio))
-        painter.drawPixmap(0, 0, original_stone)
-        painter.end()
-        # self.assets['*'] = stone_on_switch
-
-        for weight in self.stone_weights:
-            weight_str = str(weight)
-            real_str = str(-weight)
-            pixmap = QPixmap(40, 40)
-            pixmap.fill(Qt.transparent)
-            painter = QPainter(pixmap)
-            painter.drawPixmap(0, 0, stone_on_switch)
-            painter.setFont(font)
-            painter.setRenderHint(QPainter.TextAntialiasing)
-            painter.setPen(QColor(255, 255, 255))
-            text_rect = painter.boundingRect(pixmap.rect(), Qt.AlignRight, weight_str)
-            painter.drawText((40 - text_rect.width()) // 2, (40 + text_rect.height()) // 2, weight_str)
-            painter.end()
-            self.assets[real_str] = pixmap
+        self.assets = TILES.assets(self.stone_weights, self.canvas.tile_size)
 
     def load_map(self):
+        # Cancel the search for the previous map instead of leaving it running
+        self.cancel_search()
+
         # Stop any ongoing visualization if running
         if self.timer.isActive():
             self.timer.stop()
@@ -216,45 +316,46 @@ class SokobanVisualizer(QWidget):
         # Reset status texts
         self.steps_label.setText('Steps: 0')
         self.cost_label.setText('Total Cost: 0')
+        self.cached_label.hide()
+        self.refine_label.hide()
+        
+        # Drop the solution of the previous map, a paused playback cannot continue on another one
+        self.playback = None
+        self.pending = None
+        self.position = 0
+        self.is_running = False
+        self.start_button.setText('Start')
+        self.timeline.setEnabled(False)
+        self.timeline.blockSignals(True)
+        self.timeline.setValue(0)
+        self.timeline.blockSignals(False)
         
         # Get the selected map file
         map_file = self.maps[self.map_dropdown.currentIndex()]
         
-        # Read and parse the map file
-        with open(map_file, 'r') as f:
-            input_data = f.read()
+        # Read and parse the map file, each file is only read once
+        if map_file not in self.map_texts:
+            with open(map_file, 'r') as f:
+                self.map_texts[map_file] = f.read()
+        input_data = self.map_texts[map_file]
+        self.map_text = input_data
         self.stone_weights, self.grid = _utils.parse_input(input_data)
         self.ares_pos, self.stones, self.switches = _utils.find_positions(self.grid, self.stone_weights)
 
         # Load assets
         self.load_assets()
         
-        # Clear the grid layout
-        for i in reversed(range(self.grid_layout.count())):
-            widget_to_remove = self.grid_layout.itemAt(i).widget()
-            if widget_to_remove is not None:
-                widget_to_remove.setParent(None)
-        
         # Setup map dimensions, fill empty cells with ' ' and mark inside/outside walls
         map_height = len(self.grid)
         map_width = max(len(row) for row in self.grid)
         self.grid = [row + [' '] * (map_width - len(row)) for row in self.grid]
         self.mark_inside_outside_walls(map_height, map_width)
         
-        # Load textures based on cell type
-        for row in range(map_height):
-            for col in range(map_width):
-                cell = QLabel()
-                cell.setFixedSize(40, 40)
-                
-                cell_type = self.grid[row][col]
-                cell.setPixmap(self.assets[cell_type])
-                
-                # Add cell to grid layout
-                self.grid_layout.addWidget(cell, row, col)
+        # Draw the map on the canvas
+        self.canvas.set_map(self.grid, self.assets)
         
         # Adjust window size based on map size
-        self.setFixedSize(max(map_width * 40 + 100, 600), map_height * 40 + 150)
+        self.setFixedSize(max(map_width * self.canvas.tile_size + 100, 600), map_height * self.canvas.tile_size + 150)
     
     def mark_inside_outside_walls(self, map_height, map_width):
         visited = [[False for _ in range(map_width)] for _ in range(map_height)]
@@ -296,10 +397,34 @@ class SokobanVisualizer(QWidget):
             self.start_button.setText('Continue')
             return
         elif self.is_running and not self.timer.isActive():
-            self.timer.start(150)
+            # A better solution found while paused is shown from the start instead
+            if self.pending is not None:
+                self.play_pending()
+                return
+            self.start_playback()
             self.start_button.setText('Pause')
             return
+
+        # An anytime search is still improving the loaded solution, replay it instead of starting over,
+        # unless another algorithm was selected since
+        algorithm = self.algorithm_dropdown.currentText()
+        if self.search_thread is not None and self.playback is not None and self.search_thread.algorithm == algorithm:
+            self.seek(0)
+            self.start_playback()
+            self.start_button.setText('Pause')
+            self.is_running = True
+            return
           
+        self.reset_map()
+
+        # Replay a cached solution of the same map instead of searching again
+        self.result_key = runner.result_key(self.map_text, algorithm)
+        cached = self.cache.get(self.result_key)
+        if cached is not None:
+            cached['cached'] = True
+            self.on_algorithm_finished((cached, algorithm))
+            return
+
         self.loading_label.show()
         self.loading_movie.start()
         
@@ -315,15 +440,37 @@ class SokobanVisualizer(QWidget):
         self.loading_label.show()
         self.loading_movie.start()
         
-        self.reset_map()
-        algorithm = self.algorithm_dropdown.currentText()
+        # Run the selected algorithm in a separate thread, on its own copy of the map: playback edits self.grid
+        grid = [row[:] for row in self.grid]
+        thread = AlgorithmThread(algorithm, grid, self.ares_pos, self.stones, self.switches, self.stone_weights)
+        thread.solved.connect(self.on_algorithm_finished)
+        thread.improved.connect(self.on_solution_improved)
+        thread.finished.connect(lambda: self.release_thread(thread))
+        self.threads.append(thread)
+        self.search_thread = thread
+        thread.start()
+
+    def cancel_search(self):
+        if self.search_thread is None:
+            return
+
+        thread = self.search_thread
+        self.search_thread = None
+        thread.solved.disconnect(self.on_algorithm_finished)
+        thread.improved.disconnect(self.on_solution_improved)
+        thread.cancel()
+
+        self.loading_label.hide()
+        self.loading_movie.stop()
 
-        # Run the selected algorithm in a separate thread
-        self.thread = AlgorithmThread(algorithm, self.grid, self.ares_pos, self.stones, self.switches, self.stone_weights)
-        self.thread.finished.connect(self.on_algorithm_finished)
-        self.thread.start()
+    def release_thread(self, thread):
+        # QThread.finished is emitted right before the thread exits, wait() returns once it has
+        thread.wait()
+        self.threads.remove(thread)
 
     def on_algorithm_finished(self, result):
+        self.search_thread = None
+
         # Hide loading animation
         self.loading_label.hide()
         self.loading_movie.stop()
@@ -333,93 +480,110 @@ class SokobanVisualizer(QWidget):
         if result is None:
             QMessageBox.information(self, 'Error', 'No solution found.')
             return
+
+        if result.get('stopped'):
+            QMessageBox.information(self, 'Stopped', f"Search stopped ({result['stopped']}) after {result['nodes']} nodes.")
+            return
+
+        if result.get('cached'):
+            self.cached_label.show()
+        else:
+            self.cache.put(self.result_key, result)
         
         save_file = f'../output/output-{self.map_dropdown.currentIndex() + 1:02}.txt'
         with open(save_file, 'a+') as file:
             self.save_result_to_file(file, result, algorithm)
             file.close()
 
-        self.steps = 0
-        self.total_weight = result['weight_track']
-        self.path = result['path']
-        
-        self.steps_label.setText(f"Steps: {self.steps}")
-        self.cost_label.setText(f"Total Cost: 0")
-        
-        self.path_index = 0
-        self.timer.start(min(150, 5000 // result['steps']))
+        if 'optimal' in result:
+            self.refine_label.setText(f"{'Optimal' if result['optimal'] else 'Best'}: {result['weight']}")
+            self.refine_label.show()
+
+        # The first solution of an anytime search may still be playing, a better final one follows it
+        if not self.is_running:
+            self.play(result)
+        elif result['weight'] < self.playback.weights[-1]:
+            self.pending = result
+
+    def on_solution_improved(self, result):
+        result, algorithm = result
+        self.refine_label.setText(f"Improving: {result['weight']}")
+        self.refine_label.show()
+
+        # Animate the first solution while the search goes on, later ones wait for the playback to end
+        if not self.is_running:
+            self.play(result)
+        else:
+            self.pending = result
+
+    def play(self, result):
+        """Load a solution on the timeline and animate it from the initial map"""
+        # Undo the moves of the solution shown before, the new one starts from the initial map
+        self.seek(0)
+        self.pending = None
+        self.playback = Playback(self.grid, self.ares_pos, self.switches, result['path'], result['weight_track'])
+        self.position = 0
+        self.steps_label.setText('Steps: 0')
+        self.cost_label.setText('Total Cost: 0')
+        self.timeline.blockSignals(True)
+        self.timeline.setRange(0, self.playback.steps)
+        self.timeline.setValue(0)
+        self.timeline.blockSignals(False)
+        self.timeline.setEnabled(True)
+
+        self.start_playback()
         self.start_button.setText('Pause')
         self.is_running = True
+
+    def play_pending(self):
+        result, self.pending = self.pending, None
+        self.play(result)
+
+    def start_playback(self):
+        steps_per_second = SPEEDS[self.speed_dropdown.currentText()]
+        if steps_per_second is None:
+            steps_per_second = max(1000 / 150, self.playback.steps / 5)
+        interval = max(FRAME_MS, round(1000 / steps_per_second))
+        self.batch = max(1, round(steps_per_second * interval / 1000))
+        self.timer.start(interval)
+
+    def change_speed(self):
+        if self.timer.isActive():
+            self.start_playback()
         
     def next_step(self):
-        if self.path_index >= len(self.path):
+        if self.position >= self.playback.steps:
+            # A better solution arrived during playback, animate it next
+            if self.pending is not None:
+                self.play_pending()
+                return
             self.timer.stop()  # Stop the timer when path is complete
             self.start_button.setText('Start')
             self.is_running = False
             return
 
-        move = self.path[self.path_index]
-        self.execute_move(move)
-        self.path_index += 1
-        self.steps += 1
-        
-        # Update the stats after each step
-        self.steps_label.setText(f'Steps: {self.steps}')
-        self.cost_label.setText(f'Total Cost: {self.total_weight[self.steps - 1]}')
-        
-    def execute_move(self, move):
-        # Define movement deltas
-        deltas = {
-            'u': (-1, 0), 'U': (-1, 0),  # Up
-            'd': (1, 0), 'D': (1, 0),    # Down
-            'l': (0, -1), 'L': (0, -1),  # Left
-            'r': (0, 1), 'R': (0, 1)     # Right
-        }
-        
-        # Get the current position of the player (Ares)
-        current_row, current_col = self.ares_pos
-        delta_row, delta_col = deltas[move]
-        
-        # Calculate new player position
-        new_row = current_row + delta_row
-        new_col = current_col + delta_col
-        
-        # Check if it's a stone-pushing move (uppercase letter)
-        if move.isupper():
-            # Calculate stone's new position
-            stone_row = new_row + delta_row
-            stone_col = new_col + delta_col
-            
-            # Move the stone to the new position
-            self.grid[stone_row][stone_col] = str(abs(int(self.grid[new_row][new_col]))) if self.grid[stone_row][stone_col] == ' ' else str(-abs(int(self.grid[new_row][new_col])))
-            self.grid[new_row][new_col] = '+' if self.grid[new_row][new_col] == '.' else '@'
-            
-            # Update UI for the stone's new position
-            self.update_cell(stone_row, stone_col, stone=True)
-        
-        # Move the player to the new position
-        self.grid[new_row][new_col] = '@' if self.grid[new_row][new_col] == '.' else '+'
-        self.grid[current_row][current_col] = '.' if (current_row, current_col) in self.switches else ' '
-
-        # Update UI for player's new position
-        self.update_cell(new_row, new_col, player=True)
-        self.update_cell(current_row, current_col)
+        self.seek(min(self.playback.steps, self.position + self.batch))
 
-        # Update player's position for the next move
-        self.ares_pos = (new_row, new_col)
+    def seek(self, position):
+        """Show the map after `position` moves of the loaded solution"""
+        if self.playback is None or position == self.position:
+            return
 
-    def update_cell(self, row, col, player=False, stone=False):
-        """Updates the cell at (row, col) with the appropriate color and style."""
-        cell = self.grid_layout.itemAtPosition(row, col).widget()
-        
-        # Determine the cell's style based on its contents
-        cell_type = self.grid[row][col]
-        if cell_type == '#' or cell_type == '.' or cell_type == 'o' or cell_type == ' ':  # Wall, Switch, Blank, Inside Wall
-            cell.setPixmap(self.assets[cell_type])
-        elif player:
-            cell.setPixmap(self.assets['@']) # Player
-        elif stone:
-            cell.setPixmap(self.assets[cell_type]) # Stone
+        for (row, col), symbol in self.playback.changes(self.position, position).items():
+            self.grid[row][col] = symbol
+            self.update_cell(row, col)
+        self.position = position
+
+        # Update the stats and the timeline
+        self.steps_label.setText(f'Steps: {position}')
+        self.cost_label.setText(f'Total Cost: {self.playback.weights[position]}')
+        self.timeline.blockSignals(True)
+        self.timeline.setValue(position)
+        self.timeline.blockSignals(False)
+
+    def update_cell(self, row, col):
+        """Repaints the cell at (row, col) from its symbol in self.grid"""
+        self.canvas.update_cell(row, col)
  
     def reset_map(self):
         # Stop any ongoing visualization if running
@@ -431,28 +595,11 @@ class SokobanVisualizer(QWidget):
         self.start_button.setText('Start')
         self.steps_label.setText('Steps: 0')
         self.cost_label.setText('Total Cost: 0')
-        self.path_index = 0
-        self.steps = 0
-        self.total_weight = 0
         self.load_map()
 
     def save_result_to_file(self, file, result, algorithm):
-        # Check if the algorithm result is already saved in the file
-        file.seek(0)
-        if any(algorithm in line for line in file):
-            return
-
-        # Save the algorithm result to the file
-        output = (
-            f"{algorithm}\n"
-            f"Steps: {result['steps']}, "
-            f"Weight: {result['weight']}, "
-            f"Node: {result['nodes']}, "
-            f"Time (ms): {result['time_ms']}, "
-            f"Memory (MB): {result['memory_mb']}\n"
-            f"{result['path']}\n"
-        )
-        file.write(output)
+        # Skipped if the algorithm result is already saved in the file
+        runner.save_result_to_file(file, result, algorithm)
 
 # Run the application
 if __name__ == '__main__':
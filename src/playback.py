@@ -0,0 +1,64 @@
+"""Solution playback model: per-step cell diffs computed once from the path"""
+
+import search_algorithms._utils as _utils
+
+
+class Playback:
+    """Precomputed frames of a solution, so any step can be shown without replaying the moves
+
+    Args:
+        grid (list[list[str]]): displayed grid at step 0 (stones as weight strings, negative on a switch)
+        ares_pos (tuple[int, int]): Ares position at step 0
+        switches (list[tuple[int, int]]): switches positions
+        path (str): solution path in udlr/UDLR
+        weight_track (list[int]): cumulative cost after each move
+    """
+
+    def __init__(self, grid, ares_pos, switches, path, weight_track):
+        self.steps = len(path)
+        self.weights = [0] + list(weight_track)
+        # diffs[i] holds the (row, col, symbol before, symbol after) cells changed by move i
+        self.diffs = []
+
+        switches = set(switches)
+        cells = [row[:] for row in grid]
+
+        def floor(cell):
+            return '.' if cell in switches else ' '
+
+        def ares(cell):
+            return '+' if cell in switches else '@'
+
+        row, col = ares_pos
+        for move in path:
+            delta_row, delta_col = _utils.DIRECTIONS[move.lower()]
+            new_row, new_col = row + delta_row, col + delta_col
+            changes = {(row, col): floor((row, col)), (new_row, new_col): ares((new_row, new_col))}
+            if move.isupper():
+                stone_row, stone_col = new_row + delta_row, new_col + delta_col
+                weight = abs(int(cells[new_row][new_col]))
+                changes[(stone_row, stone_col)] = str(-weight) if (stone_row, stone_col) in switches else str(weight)
+
+            diff = []
+            for (cell_row, cell_col), symbol in changes.items():
+                diff.append((cell_row, cell_col, cells[cell_row][cell_col], symbol))
+                cells[cell_row][cell_col] = symbol
+            self.diffs.append(tuple(diff))
+            row, col = new_row, new_col
+
+    def changes(self, start: int, end: int):
+        """Cells to redraw to go from step start to step end, in either direction
+
+        Returns:
+            dict[tuple[int, int], str]: new symbol of every changed cell
+        """
+        cells = {}
+        if end >= start:
+            for diff in self.diffs[start:end]:
+                for row, col, _, after in diff:
+                    cells[(row, col)] = after
+        else:
+            for diff in reversed(self.diffs[end:start]):
+                for row, col, before, _ in diff:
+                    cells[(row, col)] = before
+        return cells
@@ -0,0 +1,167 @@
+from collections import deque
+from . import _utils
+
+
+def is_floor(grid: list[list[str]], row: int, col: int):
+    return 0 <= row < len(grid) and 0 <= col < len(grid[row]) and grid[row][col] != '#'
+
+
+def push_distances(grid: list[list[str]], switch: tuple[int, int]):
+    """Minimum number of pushes to bring a lone stone onto a switch
+
+    Works backwards from the switch: a stone at `cell` can be pulled to
+    `cell - d` when both `cell - d` (the stone's new cell) and `cell - 2d`
+    (where Ares steps back to) are floor. Other stones and Ares' reachability
+    are ignored, so the distances are lower bounds.
+
+    Args:
+        grid (list[list[str]]): map grid returned by find_positions
+        switch (tuple[int, int]): switch position in (row, col)
+
+    Returns:
+        dict[tuple[int, int], int]: push distance of every cell a stone can reach the switch from
+    """
+    distances = {switch: 0}
+    queue = deque([switch])
+    while queue:
+        row, col = queue.popleft()
+        step = distances[(row, col)] + 1
+        for dx, dy in _utils.DIRECTIONS.values():
+            prev_x, prev_y = row - dx, col - dy
+            if (prev_x, prev_y) in distances:
+                continue
+            if is_floor(grid, prev_x, prev_y) and is_floor(grid, prev_x - dx, prev_y - dy):
+                distances[(prev_x, prev_y)] = step
+                queue.append((prev_x, prev_y))
+    return distances
+
+
+def push_reachable(grid: list[list[str]], stone: tuple[int, int]):
+    """Cells a lone stone can be pushed to from its position
+
+    The forward counterpart of push_distances: other stones and Ares'
+    reachability are ignored, so the result is a superset of the real one.
+
+    Args:
+        grid (list[list[str]]): map grid returned by find_positions
+        stone (tuple[int, int]): stone position in (row, col)
+
+    Returns:
+        set[tuple[int, int]]: cells the stone can end up on, including its own
+    """
+    reached = {stone}
+    queue = deque([stone])
+    while queue:
+        row, col = queue.popleft()
+        for dx, dy in _utils.DIRECTIONS.values():
+            next_x, next_y = row + dx, col + dy
+            if (next_x, next_y) in reached:
+                continue
+            if is_floor(grid, next_x, next_y) and is_floor(grid, row - dx, col - dy):
+                reached.add((next_x, next_y))
+                queue.append((next_x, next_y))
+    return reached
+
+
+def live_squares(grid: list[list[str]], switches: list[tuple[int, int]]):
+    """Find every cell from which a stone can still be pushed onto some switch
+
+    Args:
+        grid (list[list[str]]): map grid returned by find_positions
+        switches (list[tuple[int, int]]): switches positions in (row, col)
+
+    Returns:
+        set[tuple[int, int]]: cells a lone stone can be pushed from onto a switch
+    """
+    live = set()
+    for switch in switches:
+        live.update(push_distances(grid, switch))
+    return live
+
+
+def dead_squares(grid: list[list[str]], switches: list[tuple[int, int]]):
+    """Find floor cells a stone must never be pushed onto
+
+    Args:
+        grid (list[list[str]]): map grid returned by find_positions
+        switches (list[tuple[int, int]]): switches positions in (row, col)
+
+    Returns:
+        set[tuple[int, int]]: floor cells from which no switch can be reached
+    """
+    live = live_squares(grid, switches)
+    return {
+        (i, j)
+        for i, row in enumerate(grid)
+        for j, cell in enumerate(row)
+        if cell != '#' and (i, j) not in live
+    }
+
+
+def walk_distances(grid: list[list[str]], start: tuple[int, int], stones):
+    """Flood-fill the cells Ares can walk to without pushing anything
+
+    Args:
+        grid (list[list[str]]): map grid returned by find_positions
+        start (tuple[int, int]): Ares position in (row, col)
+        stones (list[tuple[int, int]] | set[tuple[int, int]]): stone positions, treated as obstacles
+
+    Returns:
+        dict[tuple[int, int], int]: walking distance to every reachable cell
+    """
+    distances = {start: 0}
+    queue = deque([start])
+    while queue:
+        row, col = queue.popleft()
+        step = distances[(row, col)] + 1
+        for dx, dy in _utils.DIRECTIONS.values():
+            pos = (row + dx, col + dy)
+            if pos not in distances and grid[pos[0]][pos[1]] != '#' and pos not in stones:
+                distances[pos] = step
+                queue.append(pos)
+    return distances
+
+
+def normalized_position(grid: list[list[str]], ares: tuple[int, int], stones):
+    """Top-left-most cell of the region Ares can walk to
+
+    Args:
+        grid (list[list[str]]): map grid returned by find_positions
+        ares (tuple[int, int]): Ares position in (row, col)
+        stones (list[tuple[int, int]] | set[tuple[int, int]]): stone positions, treated as obstacles
+
+    Returns:
+        tuple[int, int]: canonical position shared by every cell of the region
+    """
+    return min(walk_distances(grid, ares, stones))
+
+
+def walk_path(grid: list[list[str]], start: tuple[int, int], goal: tuple[int, int], stones):
+    """Shortest walk between two cells without pushing anything
+
+    Args:
+        grid (list[list[str]]): map grid returned by find_positions
+        start (tuple[int, int]): Ares position in (row, col)
+        goal (tuple[int, int]): cell to walk to
+        stones (list[tuple[int, int]] | set[tuple[int, int]]): stone positions, treated as obstacles
+
+    Returns:
+        str | None: lowercase moves from start to goal, None if goal is unreachable
+    """
+    parents = {start: None}
+    queue = deque([start])
+    while queue and goal not in parents:
+        row, col = queue.popleft()
+        for move, (dx, dy) in _utils.DIRECTIONS.items():
+            pos = (row + dx, col + dy)
+            if pos not in parents and grid[pos[0]][pos[1]] != '#' and pos not in stones:
+                parents[pos] = ((row, col), move)
+                queue.append(pos)
+    if goal not in parents:
+        return None
+
+    moves = []
+    while parents[goal] is not None:
+        goal, move = parents[goal]
+        moves.append(move)
+    return ''.join(reversed(moves))
@@ -0,0 +1,112 @@
+from . import _analysis
+
+
+def square_deadlock(grid, stone, stones, switches, dead):
+    """Check the four 2x2 squares around a stone for a wall/stone block
+
+    Args:
+        grid (list[list[str]]): map grid returned by find_positions
+        stone (tuple[int, int]): position of the stone that was just pushed
+        stones (set[tuple[int, int]]): positions of all stones after the push
+        switches (set[tuple[int, int]]): switches positions
+        dead (set[tuple[int, int]]): static dead squares
+
+    Returns:
+        bool: whether some square is fully blocked with a stone off a switch
+    """
+    row, col = stone
+    for dx in (-1, 0):
+        for dy in (-1, 0):
+            cells = [(row + dx + i, col + dy + j) for i in (0, 1) for j in (0, 1)]
+            if all(cell in stones or not _analysis.is_floor(grid, *cell) for cell in cells):
+                if any(cell in stones and cell not in switches for cell in cells):
+                    return True
+    return False
+
+
+def freeze_deadlock(grid, stone, stones, switches, dead):
+    """Check whether a stone is frozen together with a stone off a switch
+
+    A stone is frozen when it cannot move along either axis: each axis is
+    blocked by a wall, by dead squares on both sides, or by a neighbour stone
+    which is itself frozen. While a stone is being checked it is treated as a
+    wall, which keeps the recursion from cycling.
+
+    Args:
+        grid (list[list[str]]): map grid returned by find_positions
+        stone (tuple[int, int]): position of the stone that was just pushed
+        stones (set[tuple[int, int]]): positions of all stones after the push
+        switches (set[tuple[int, int]]): switches positions
+        dead (set[tuple[int, int]]): static dead squares
+
+    Returns:
+        bool: whether the pushed stone froze a stone which is not on a switch
+    """
+    frozen = []
+    if not _is_frozen(grid, stone, stones, dead, frozen, set()):
+        return False
+    return any(pos not in switches for pos in frozen)
+
+
+def _is_frozen(grid, stone, stones, dead, frozen, checking):
+    # Stones in `frozen` past `mark` were only proven frozen assuming this one is,
+    # so they are dropped again if it turns out to be movable
+    mark = len(frozen)
+    checking.add(stone)
+    row, col = stone
+    for dx, dy in ((1, 0), (0, 1)):
+        before, after = (row - dx, col - dy), (row + dx, col + dy)
+        if not _analysis.is_floor(grid, *before) or not _analysis.is_floor(grid, *after):
+            continue
+        if before in dead and after in dead:
+            continue
+        if any(
+            pos in stones and (pos in checking or pos in frozen or _is_frozen(grid, pos, stones, dead, frozen, checking))
+            for pos in (before, after)
+        ):
+            continue
+        checking.discard(stone)
+        del frozen[mark:]
+        return False
+    checking.discard(stone)
+    frozen.append(stone)
+    return True
+
+
+RULES = {
+    '2x2': square_deadlock,
+    'freeze': freeze_deadlock,
+}
+DEFAULT_RULES = ('2x2', 'freeze')
+
+
+class DeadlockDetector:
+    """Pluggable pruning stage run after every push
+
+    Rules are tried in order and the first one that fires is credited in
+    `hits`, so the counters show which rules pay for their cost.
+    """
+
+    def __init__(self, grid, switches, rules=DEFAULT_RULES, dead=None):
+        self.grid = grid
+        self.switches = set(switches)
+        self.dead = dead if dead is not None else _analysis.dead_squares(grid, switches)
+        self.rules = [(name, RULES[name]) for name in rules]
+        self.hits = {name: 0 for name in rules}
+
+    def __call__(self, stone, stones):
+        """Check whether pushing a stone to `stone` leads to a deadlock
+
+        Args:
+            stone (tuple[int, int]): position the stone was pushed to
+            stones (list[tuple[int, int]]): positions of all stones after the push
+
+        Returns:
+            bool: True if the push should be pruned
+        """
+        occupied = set(stones)
+        for name, rule in self.rules:
+            if rule(self.grid, stone, occupied, self.switches, self.dead):
+                self.hits[name] += 1
+                return True
+        return False
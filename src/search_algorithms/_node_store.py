@@ -0,0 +1,74 @@
+from array import array
+
+
+class NodeStore:
+    """Arena of search nodes addressed by integer node id
+
+    A node only records its parent id, the move that produced it and the
+    cumulative cost, so creating a successor is O(1) no matter how deep it is.
+    The path and weight track are rebuilt once, from the goal node.
+    """
+
+    ROOT = 0
+
+    def __init__(self):
+        self.parents = array('i', [-1])
+        self.moves = bytearray(b' ')
+        self.costs = array('q', [0])
+
+    def __len__(self):
+        return len(self.parents)
+
+    def add(self, parent: int, move: str, cost: int):
+        """Append a node and return its id
+
+        Args:
+            parent (int): id of the node this one was expanded from
+            move (str): move taken from the parent ('u', 'D', ...)
+            cost (int): cumulative cost from the root
+
+        Returns:
+            int: id of the new node
+        """
+        self.parents.append(parent)
+        self.moves.append(ord(move))
+        self.costs.append(cost)
+        return len(self.parents) - 1
+
+    def cost(self, node_id: int):
+        return self.costs[node_id]
+
+    def lineage(self, node_id: int):
+        """List the ids on the way from the root down to a node
+
+        Args:
+            node_id (int): id of the last node
+
+        Returns:
+            list[int]: node ids after the root, ending with node_id
+        """
+        ids = []
+        while node_id != self.ROOT:
+            ids.append(node_id)
+            node_id = self.parents[node_id]
+        ids.reverse()
+        return ids
+
+    def reconstruct(self, node_id: int):
+        """Rebuild the path and weight track leading to a node
+
+        Args:
+            node_id (int): id of the node to trace back from
+
+        Returns:
+            (str, list[int]): moves from the root and cumulative cost after each move
+        """
+        moves = []
+        weight_track = []
+        while node_id != self.ROOT:
+            moves.append(chr(self.moves[node_id]))
+            weight_track.append(self.costs[node_id])
+            node_id = self.parents[node_id]
+        moves.reverse()
+        weight_track.reverse()
+        return ''.join(moves), weight_track
@@ -0,0 +1,319 @@
+import math
+import heapq
+from collections import deque
+from . import _utils, _analysis, _deadlock, heuristics, limits, metrics
+from ._node_store import NodeStore
+from ._state import StateCodec, Node, RegionTable
+
+
+def successors(grid, ares, stones, placed, stone_weights, switches, dead, deadlocks, stats=None):
+    """Legal moves of a state, shared by every step-level solver
+
+    Args:
+        grid (list[list[str]]): map grid returned by find_positions
+        ares (tuple[int, int]): Ares position
+        stones (tuple[tuple[int, int], ...]): stone positions by stone index
+        placed (int): number of stones on a switch
+        stone_weights (list[int]): stone weights by stone index
+        switches (set[tuple[int, int]]): switches positions
+        dead (set[tuple[int, int]]): static dead squares
+        deadlocks (DeadlockDetector | None): dynamic deadlock rules
+        stats (Metrics | None): pruned pushes are counted in it
+
+    Returns:
+        list[tuple]: (move, new_ares, new_stones, cost, pushed, placed) per legal move, pushed
+            being (stone index, old, new position) for a push and None for a walk
+    """
+    neighbors = []
+    ares_x, ares_y = ares
+    stone_at = {stone: idx for idx, stone in enumerate(stones)}
+
+    for move, (dx, dy) in _utils.DIRECTIONS.items():
+        new_x, new_y = ares_x + dx, ares_y + dy
+
+        if grid[new_x][new_y] == '#':
+            continue
+
+        move_cost = 1
+        new_stones = stones
+        new_placed = placed
+        pushed = None
+
+        stone_idx = stone_at.get((new_x, new_y))
+        if stone_idx is not None:
+            stone_x, stone_y = new_x + dx, new_y + dy
+
+            if grid[stone_x][stone_y] == '#' or (stone_x, stone_y) in stone_at:
+                continue
+
+            new_stones = list(stones)
+            new_stones[stone_idx] = (stone_x, stone_y)
+            if (stone_x, stone_y) in dead or (deadlocks and deadlocks((stone_x, stone_y), new_stones)):
+                if stats:
+                    stats.pruned += 1
+                continue
+
+            move = move.upper()
+            move_cost += stone_weights[stone_idx]
+            pushed = (stone_idx, (new_x, new_y), (stone_x, stone_y))
+            new_placed += ((stone_x, stone_y) in switches) - ((new_x, new_y) in switches)
+            new_stones = tuple(new_stones)
+
+        neighbors.append((move, (new_x, new_y), new_stones, move_cost, pushed, new_placed))
+
+    return neighbors
+
+
+class FifoFrontier:
+    """First in, first out: breadth-first order, priorities are ignored"""
+
+    __slots__ = ('entries',)
+
+    def __init__(self):
+        self.entries = deque()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def push(self, priority, node):
+        self.entries.append((priority, node))
+
+    def pop(self):
+        return self.entries.popleft()
+
+
+class LifoFrontier:
+    """Last in, first out: depth-first order, priorities are ignored"""
+
+    __slots__ = ('entries',)
+
+    def __init__(self):
+        self.entries = []
+
+    def __len__(self):
+        return len(self.entries)
+
+    def push(self, priority, node):
+        self.entries.append((priority, node))
+
+    def pop(self):
+        return self.entries.pop()
+
+
+class PriorityFrontier:
+    """Lowest priority first, ties broken by node id so older nodes come first"""
+
+    __slots__ = ('entries',)
+
+    def __init__(self):
+        self.entries = []
+
+    def __len__(self):
+        return len(self.entries)
+
+    def push(self, priority, node):
+        heapq.heappush(self.entries, (priority, node))
+
+    def pop(self):
+        return heapq.heappop(self.entries)
+
+    def rebuild(self, entries):
+        # Replace every entry at once, e.g. reordered for a new heuristic weight
+        self.entries = list(entries)
+        heapq.heapify(self.entries)
+
+
+# Frontier policy name -> class, entries are (priority, Node) with priority = g + h
+FRONTIERS = {
+    'fifo': FifoFrontier,
+    'lifo': LifoFrontier,
+    'priority': PriorityFrontier,
+}
+
+
+def search(grid, ares_pos, stones, switches, stone_weights, frontier='priority', heuristic=None, deadlock_rules=None, normalize=False, weights=None, on_solution=None, progress=None, budget=None, cancel=None, profile='rss'):
+    """Generic graph search over single steps, configured by its frontier policy
+
+    Nodes are ordered by g + h, which only matters for the 'priority' policy:
+    without a heuristic it is uniform-cost search, with one it is A*. A state
+    reached again with a lower cost is queued again, and the older, costlier
+    entry is skipped when it comes out of the frontier. The goal is tested
+    when a node is expanded. `nodes` in the result is the number of generated
+    nodes, for every policy.
+
+    With `weights` the search is anytime (ARA*, 'priority' policy only): nodes
+    are ordered by g + w * h, one pass per weight. A solution does not end the
+    search but becomes the incumbent, and nodes with g + h above it are dropped.
+    A pass ends once no open node can lead to a cheaper solution under its
+    weight; the next one goes on from the same open nodes and costs, reordered
+    for its weight, and reopens the nodes whose cost dropped after they were
+    expanded. A last pass with w = 1 proves the incumbent optimal.
+
+    Args:
+        grid, ares_pos, stones, switches, stone_weights: map as returned by parse_input/find_positions
+        frontier (str): key of FRONTIERS
+        heuristic (str | None): key of heuristics.HEURISTICS, None for h = 0
+        deadlock_rules (tuple[str, ...] | None): keys of _deadlock.RULES applied after every push
+        normalize (bool): merge states reached by a push whose stones match and whose Ares
+            is in the same walkable region (see RegionTable), trading optimality for fewer states.
+            Only bfs offers it: UCS and A* would lose their optimal weight (map 3 UCS: 450, not 438)
+        weights (tuple[float, ...] | None): heuristic weight of each anytime pass, decreasing,
+            None to stop at the first solution
+        on_solution (callable | None): with weights, called with a solver result every time a cheaper solution is found
+        progress (callable | None): called with the generated count every PROGRESS_INTERVAL nodes
+        budget (Budget | None): limits on time, expanded and stored nodes
+        cancel (CancelToken | None): stops the search when set
+        profile (str): key of metrics.METRICS
+
+    Returns:
+        dict | None: solver result, None if no solution was found. With weights, the best
+            solution with 'optimal' telling whether it was proven optimal and 'solutions'
+            listing the steps, weight, nodes, time and heuristic weight of every solution
+            found; a budget or cancel then returns the best solution so far if there is one,
+            with 'stopped' set to the stop reason as in a partial result
+    """
+    stats = metrics.start(profile)
+
+    estimate = heuristics.HEURISTICS[heuristic](grid, switches, stone_weights) if heuristic else None
+    codec = StateCodec(grid, stone_weights)
+    dead = _analysis.dead_squares(grid, switches)
+    deadlocks = _deadlock.DeadlockDetector(grid, switches, deadlock_rules, dead) if deadlock_rules else None
+    regions = RegionTable(grid, codec) if normalize else None
+    store = NodeStore()
+    switch_set = set(switches)
+    frontier = FRONTIERS[frontier]()
+    passes = weights or (1,)
+
+    start_state = codec.encode(ares_pos, stones)
+    visited = {start_state: 0}
+    frontier.push(passes[0] * estimate(ares_pos, stones) if estimate else 0, Node(start_state, store.ROOT, 0, _utils.count_on_switches(stones, switch_set)))
+    best_cost = math.inf
+    best_id = None
+    solutions = []
+    inconsistent = []
+
+    def result(optimal):
+        path, weight_track = store.reconstruct(best_id)
+        solution = {
+            'steps': len(path),
+            'weight': best_cost,
+            'nodes': stats.generated,
+            'time_ms': stats.time_ms,
+            'memory_mb': stats.memory_mb,
+            'path': path,
+            'weight_track': weight_track,
+            'deadlocks': deadlocks.hits if deadlocks else {},
+            'merged': regions.merged if regions else 0,
+            'metrics': stats.counters()
+        }
+        if weights:
+            solution['optimal'] = optimal
+            solution['solutions'] = list(solutions)
+        return solution
+
+    for index, weight in enumerate(passes):
+        if index:
+            # Same open nodes and costs, reordered for this pass; stale and hopeless entries are dropped
+            entries = []
+            for priority, node in frontier.entries + inconsistent:
+                h = (priority - node.g) / passes[index - 1]
+                if node.g == visited[node.state] and node.g + h < best_cost:
+                    entries.append((node.g + weight * h, node))
+            frontier.rebuild(entries)
+        closed = set()
+        inconsistent = []
+        # The last pass reopens nodes right away, like a_star, so nothing is left over once it ends
+        reopen = index == len(passes) - 1
+
+        while frontier:
+            if len(frontier) > stats.frontier_peak:
+                stats.frontier_peak = len(frontier)
+            priority, node = frontier.pop()
+            if priority >= best_cost:
+                # No open node can lead to a cheaper solution under this weight
+                frontier.push(priority, node)
+                break
+            if node.g > visited[node.state]:
+                # The state was queued again with a lower cost after this entry
+                stats.duplicates += 1
+                continue
+
+            if not reopen:
+                closed.add(node.state)
+            ares, stones = codec.decode(node.state)
+            node_id, g = node.node_id, node.g
+            stats.expanded += 1
+            if (budget or cancel) and stats.expanded % limits.CHECK_INTERVAL == 0:
+                stopped = limits.stop_reason(budget, cancel, stats, len(visited))
+                if stopped:
+                    stats.visited = len(visited)
+                    stats.stop()
+                    if best_id is not None:
+                        # A full solution, but not a finished search: flagged like a partial result
+                        solution = result(False)
+                        solution['stopped'] = stopped
+                        return solution
+                    path, weight_track = store.reconstruct(node_id)
+                    return limits.partial_result(stopped, path, weight_track, stats.generated, stats, deadlocks)
+
+            if node.placed == len(stones):
+                best_cost, best_id = g, node_id
+                stats.visited = len(visited)
+                if not weights:
+                    stats.stop()
+                    return result(None)
+                stats.checkpoint()
+                solutions.append({
+                    'steps': len(store.lineage(node_id)),
+                    'weight': g,
+                    'nodes': stats.generated,
+                    'time_ms': stats.time_ms,
+                    'heuristic_weight': weight
+                })
+                if on_solution:
+                    on_solution(result(False))
+                continue
+
+            children = []
+            for move, new_ares, new_stones, cost, pushed, placed in successors(grid, ares, stones, node.placed, stone_weights, switch_set, dead, deadlocks, stats):
+                new_g = g + cost
+                new_state = codec.encode(new_ares, new_stones)
+                if new_state in visited and visited[new_state] <= new_g:
+                    stats.duplicates += 1
+                    continue
+                if regions and pushed and regions.seen(new_ares, new_stones):
+                    stats.pruned += 1
+                    continue
+                children.append((move, new_stones, new_g, new_state, pushed, placed))
+
+            if estimate:
+                # Walking leaves the stones, and so the heuristic, unchanged; the pushes are scored in one batch
+                h = priority - g
+                if weight != 1:
+                    h /= weight
+                pushes = [child for child in children if child[4]]
+                scores = iter(estimate.batch([child[1] for child in pushes], [child[4] for child in pushes]))
+            for move, new_stones, new_g, new_state, pushed, placed in children:
+                new_h = 0
+                if estimate:
+                    new_h = next(scores) if pushed else h
+                # Dead ends (h = inf) and, with weights, nodes which cannot beat the incumbent
+                if new_g + new_h >= best_cost:
+                    stats.pruned += 1
+                    continue
+
+                visited[new_state] = new_g
+                child = Node(new_state, store.add(node_id, move, new_g), new_g, placed)
+                if not reopen and new_state in closed:
+                    inconsistent.append((new_g + weight * new_h, child))
+                else:
+                    frontier.push(new_g + weight * new_h, child)
+                stats.generated += 1
+                if progress and stats.generated % _utils.PROGRESS_INTERVAL == 0:
+                    progress(stats.generated)
+
+    stats.visited = len(visited)
+    stats.stop()
+    if best_id is None:
+        return None
+    return result(passes[-1] <= 1)
@@ -0,0 +1,124 @@
+from . import _analysis
+
+
+class StateCodec:
+    """Packs (ares, stones) into a single int over the flattened grid
+
+    Every position becomes a cell index (row * width + col) and the state is the
+    concatenation of Ares' cell followed by one cell per stone, in stone index
+    order, so the weight of each stone stays tied to its slot. Stones sharing the
+    same weight are interchangeable, their cells are sorted within the group to
+    make the key canonical.
+    """
+
+    __slots__ = ('width', 'bits', 'mask', 'count', 'groups')
+
+    def __init__(self, grid: list[list[str]], stone_weights: list[int]):
+        self.width = max(len(row) for row in grid)
+        self.bits = (len(grid) * self.width).bit_length()
+        self.mask = (1 << self.bits) - 1
+        self.count = len(stone_weights)
+
+        same_weight = {}
+        for i, weight in enumerate(stone_weights):
+            same_weight.setdefault(weight, []).append(i)
+        self.groups = [group for group in same_weight.values() if len(group) > 1]
+
+    def cell(self, pos: tuple[int, int]):
+        return pos[0] * self.width + pos[1]
+
+    def position(self, cell: int):
+        return divmod(cell, self.width)
+
+    def encode(self, ares: tuple[int, int], stones):
+        """Pack a state into an int
+
+        Args:
+            ares (tuple[int, int]): Ares position in (row, col)
+            stones (list[tuple[int, int]] | tuple[tuple[int, int], ...]): stone positions by stone index
+
+        Returns:
+            int: canonical packed state
+        """
+        width = self.width
+        cells = [row * width + col for row, col in stones]
+        for group in self.groups:
+            for i, cell in zip(group, sorted(cells[i] for i in group)):
+                cells[i] = cell
+
+        key = ares[0] * width + ares[1]
+        bits = self.bits
+        for cell in cells:
+            key = (key << bits) | cell
+        return key
+
+    def decode(self, key: int):
+        """Unpack a state produced by encode
+
+        Args:
+            key (int): packed state
+
+        Returns:
+            (tuple[int, int], tuple[tuple[int, int], ...]): Ares and stone positions in (row, col)
+        """
+        width, bits, mask = self.width, self.bits, self.mask
+        stones = [None] * self.count
+        for i in range(self.count - 1, -1, -1):
+            stones[i] = divmod(key & mask, width)
+            key >>= bits
+        return divmod(key, width), tuple(stones)
+
+
+class Node:
+    """Frontier entry shared by the solvers: a packed state and its NodeStore id
+
+    `placed` counts the stones standing on a switch. Successors update it from
+    the one stone a push moves, so the goal test is a comparison with the
+    number of stones instead of a scan.
+    """
+
+    __slots__ = ('state', 'node_id', 'g', 'placed')
+
+    def __init__(self, state: int, node_id: int, g: int = 0, placed: int = 0):
+        self.state = state
+        self.node_id = node_id
+        self.g = g
+        self.placed = placed
+
+    def __lt__(self, other):
+        return self.node_id < other.node_id
+
+
+class RegionTable:
+    """Duplicate table keyed by stones plus Ares' normalized position
+
+    States with identical stones and Ares anywhere in the same walkable region
+    are equivalent for the rest of the search. Only states entered by a push
+    are checked, so walking inside a region is still possible; the first
+    arrival wins, which trades optimality for fewer states.
+    """
+
+    __slots__ = ('grid', 'codec', 'keys', 'merged')
+
+    def __init__(self, grid: list[list[str]], codec: StateCodec):
+        self.grid = grid
+        self.codec = codec
+        self.keys = set()
+        self.merged = 0
+
+    def seen(self, ares: tuple[int, int], stones):
+        """Record a state reached by a push
+
+        Args:
+            ares (tuple[int, int]): Ares position after the push
+            stones (list[tuple[int, int]]): stone positions after the push
+
+        Returns:
+            bool: True if an equivalent state was recorded before (the state is merged)
+        """
+        key = self.codec.encode(_analysis.normalized_position(self.grid, ares, stones), stones)
+        if key in self.keys:
+            self.merged += 1
+            return True
+        self.keys.add(key)
+        return False
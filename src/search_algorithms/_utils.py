@@ -8,6 +8,9 @@ DIRECTIONS = {
     'r': (0, 1)
 }
 
+# Solvers call their progress callback every PROGRESS_INTERVAL nodes
+PROGRESS_INTERVAL = 1000
+
 
 def parse_input(input_string: str):
     """Define the Maze and Parse the Input
@@ -50,14 +53,27 @@ def find_positions(grid: list[list[str]], stone_weights: list[int]):
     return ares_pos, stones, switches
 
 
-def all_stones_on_switches(stones: list[tuple[int, int]], switches: list[tuple[int, int]]):
+def all_stones_on_switches(stones: list[tuple[int, int]], switches: set[tuple[int, int]]):
     """Check if all stones are on switches
 
     Args:
         stones (list[tuple[int, int]]): list of positions of stones
-        switches (list[tuple[int, int]]): list of positions of switches
+        switches (set[tuple[int, int]]): positions of switches, a list works too but is scanned for every stone
 
     Returns:
         bool: whether all stones are on switches
     """
     return all(stone in switches for stone in stones)
+
+
+def count_on_switches(stones: list[tuple[int, int]], switches: set[tuple[int, int]]):
+    """Count the stones standing on a switch
+
+    Args:
+        stones (list[tuple[int, int]]): list of positions of stones
+        switches (set[tuple[int, int]]): positions of switches
+
+    Returns:
+        int: number of stones on switches, the map is solved when it equals len(stones)
+    """
+    return sum(stone in switches for stone in stones)
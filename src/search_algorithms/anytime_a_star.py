@@ -0,0 +1,38 @@
+from . import _deadlock
+from ._search import search
+
+# Heuristic weight of each pass, the last one being 1 is what proves the final solution optimal
+DEFAULT_WEIGHTS = (5, 3, 2, 1.5, 1)
+
+
+def anytime_a_star(grid, ares_pos, stones, switches, stone_weights, weights=DEFAULT_WEIGHTS, heuristic='assignment', deadlock_rules=_deadlock.DEFAULT_RULES, on_solution=None, progress=None, budget=None, cancel=None, profile='rss'):
+    """Anytime weighted A*: a quick first solution, improved until it is proven optimal
+
+    Nodes are ordered by g + w * h, starting with a high weight w, which finds
+    a solution of weight at most w times the optimum after few expansions. Each
+    pass ends once no open node can lead to a cheaper solution under the current
+    weight, and the next pass lowers w and goes on from the same open list and
+    costs (ARA*): nodes whose cost dropped after they were expanded in a pass
+    are set aside and reopened at the start of the next one, and nodes with
+    g + h above the best solution so far are dropped. The pass with w = 1 ends
+    with the best solution proven optimal, as with a_star.
+
+    Args:
+        grid, ares_pos, stones, switches, stone_weights: map as returned by parse_input/find_positions
+        weights (tuple[float, ...]): heuristic weight of each pass, decreasing
+        heuristic (str): key of heuristics.HEURISTICS
+        deadlock_rules (tuple[str, ...] | None): keys of _deadlock.RULES applied after every push
+        on_solution (callable | None): called with a solver result every time a cheaper solution is found
+        progress (callable | None): called with the generated count every PROGRESS_INTERVAL nodes
+        budget (Budget | None): limits on time, expanded and stored nodes
+        cancel (CancelToken | None): stops the search when set
+        profile (str): key of metrics.METRICS
+
+    Returns:
+        dict | None: the best solution, with 'optimal' telling whether it was proven optimal and
+            'solutions' listing the steps, weight, nodes, time and heuristic weight of every
+            solution found. A stopped search returns its best solution with 'stopped' set, or the
+            usual partial result before its first solution. None if there is no solution
+    """
+    return search(grid, ares_pos, stones, switches, stone_weights, 'priority', heuristic=heuristic, deadlock_rules=deadlock_rules, weights=weights,
+                  on_solution=on_solution, progress=progress, budget=budget, cancel=cancel, profile=profile)
@@ -0,0 +1,340 @@
+import math
+import heapq
+from itertools import combinations
+from . import _utils, _analysis, _deadlock, limits, metrics
+from ._node_store import NodeStore
+from ._state import StateCodec, Node
+
+
+class _Side:
+    """Frontier and stored nodes of one search direction
+
+    Backward nodes point to the node they were pulled from, so following the
+    parents of a backward node leads to a goal state instead of the start.
+    """
+
+    __slots__ = ('store', 'states', 'frontier', 'best', 'expanded')
+
+    def __init__(self, root_state=None):
+        self.store = NodeStore()
+        self.states = [root_state] # exact state of every stored node, indexed by node id
+        self.frontier = []
+        self.best = {} # exact state -> id of its cheapest node
+        self.expanded = {} # region state -> node id, feasible mode only
+        if root_state is not None:
+            self.best[root_state] = self.store.ROOT
+            self.frontier.append((0, Node(root_state, self.store.ROOT)))
+
+    def add(self, parent: int, move: str, cost: int, state: int):
+        node_id = self.store.add(parent, move, cost)
+        self.states.append(state)
+        self.best[state] = node_id
+        heapq.heappush(self.frontier, (cost, Node(state, node_id)))
+        return node_id
+
+    def cost(self, state: int):
+        return self.store.cost(self.best[state])
+
+
+def _is_after_push(grid, ares, stones):
+    # Ares stands where a stone was just pushed from, so some stone is next to it
+    # with floor on the other side for Ares to have come from
+    return any(
+        (ares[0] + dx, ares[1] + dy) in stones and _analysis.is_floor(grid, ares[0] - dx, ares[1] - dy)
+        for dx, dy in _utils.DIRECTIONS.values()
+    )
+
+
+def _assignments(switches, stone_weights):
+    """Every way of putting the stones on distinct switches, up to swapping stones of the same weight
+
+    Stones of the same weight are interchangeable, so each weight group takes a
+    combination of the switches left by the groups before it instead of every
+    ordering of them.
+
+    Args:
+        switches (list[tuple[int, int]]): switches positions
+        stone_weights (list[int]): stone weights by stone index
+
+    Yields:
+        tuple[tuple[int, int], ...]: switch of each stone, by stone index
+    """
+    groups = {}
+    for stone_idx, weight in enumerate(stone_weights):
+        groups.setdefault(weight, []).append(stone_idx)
+    groups = list(groups.values())
+    cells = [None] * len(stone_weights)
+
+    def place(group_idx, free):
+        if group_idx == len(groups):
+            yield tuple(cells)
+            return
+        group = groups[group_idx]
+        for chosen in combinations(free, len(group)):
+            for stone_idx, cell in zip(group, chosen):
+                cells[stone_idx] = cell
+            yield from place(group_idx + 1, [cell for cell in free if cell not in chosen])
+
+    yield from place(0, list(switches))
+
+
+def _goal_states(grid, codec, stone_weights, switches, inside, optimal, stop=None):
+    """Packed states with every stone on a switch, the backward search starts from all of them
+
+    Args:
+        grid (list[list[str]]): map grid returned by find_positions
+        codec (StateCodec): codec of the search
+        stone_weights (list[int]): stone weights by stone index
+        switches (list[tuple[int, int]]): switches positions
+        inside (set[tuple[int, int]]): floor cells Ares can reach when stones are ignored
+        optimal (bool): one state per cell Ares can stand on after the last push instead of one per walkable region
+        stop (callable | None): called with the number of goals so far after every assignment,
+            returns a stop reason to give up on the enumeration
+
+    Returns:
+        (set[int], str | None): goal states, and the stop reason if the enumeration was cut short
+    """
+    goals = set()
+    for assignment in _assignments(switches, stone_weights):
+        occupied = set(assignment)
+        free = inside - occupied
+        while free:
+            region = _analysis.walk_distances(grid, min(free), occupied)
+            free -= region.keys()
+            if not optimal:
+                goals.add(codec.encode(min(region), assignment))
+                continue
+            for ares in region:
+                if _is_after_push(grid, ares, occupied):
+                    goals.add(codec.encode(ares, assignment))
+        stopped = stop(len(goals)) if stop else None
+        if stopped:
+            return goals, stopped
+    return goals, None
+
+
+def _replay(grid, stone_weights, ares, configurations, pushes):
+    """Expand a chain of pushes into the full udlr/UDLR path
+
+    Args:
+        grid (list[list[str]]): map grid returned by find_positions
+        stone_weights (list[int]): stone weights by stone index
+        ares (tuple[int, int]): Ares position before the first push
+        configurations (list[tuple[tuple[int, int], ...]]): stone positions before the first push and after each push
+        pushes (list[str]): direction of each push in UDLR
+
+    Returns:
+        (str, list[int]): moves and cumulative cost after each move
+    """
+    path = []
+    weight_track = []
+    total_cost = 0
+    for stones, new_stones, push in zip(configurations, configurations[1:], pushes):
+        # The pushed stone is the one cell that differs, whichever order the codec put the stones in
+        stone = (set(stones) - set(new_stones)).pop()
+        dx, dy = _utils.DIRECTIONS[push.lower()]
+
+        for move in _analysis.walk_path(grid, ares, (stone[0] - dx, stone[1] - dy), stones):
+            total_cost += 1
+            path.append(move)
+            weight_track.append(total_cost)
+
+        total_cost += 1 + stone_weights[stones.index(stone)]
+        path.append(push)
+        weight_track.append(total_cost)
+        ares = stone
+
+    return ''.join(path), weight_track
+
+
+def _join(grid, codec, stone_weights, forward, backward, forward_id, backward_id):
+    """Path of the forward chain to forward_id followed by the backward chain from backward_id to its goal"""
+    ids = forward.store.lineage(forward_id)
+    ares, stones = codec.decode(forward.states[forward.store.ROOT])
+    configurations = [stones] + [codec.decode(forward.states[node_id])[1] for node_id in ids]
+    pushes = [chr(forward.store.moves[node_id]) for node_id in ids]
+
+    if backward_id is not None:
+        node_id = backward_id
+        parent = backward.store.parents[node_id]
+        # The first backward node of the chain is a goal state, the root above it is a placeholder
+        while parent != backward.store.ROOT:
+            configurations.append(codec.decode(backward.states[parent])[1])
+            pushes.append(chr(backward.store.moves[node_id]))
+            node_id, parent = parent, backward.store.parents[parent]
+
+    return _replay(grid, stone_weights, ares, configurations, pushes)
+
+
+def bidirectional(grid, ares_pos, stones, switches, stone_weights, optimal=False, deadlock_rules=_deadlock.DEFAULT_RULES, progress=None, budget=None, cancel=None, profile='rss'):
+    """Search pushes forward from the start and pulls backward from every goal until they meet
+
+    Both directions work on push-level states like push_search. The backward
+    search starts from every assignment of stones to switches, with Ares
+    anywhere it could stand after the last push, and pulls stones away from
+    them. It only keeps stones on cells some stone can be pushed to from the
+    start, which is what makes it cheap on maps whose switches are hard to
+    reach. The side with the smaller frontier is expanded next.
+
+    Args:
+        grid, ares_pos, stones, switches, stone_weights: map as returned by parse_input/find_positions
+        optimal (bool): by default states are merged per walkable region and the search stops at the
+            first meeting, which is fast but not weight-optimal. When set, states keep Ares' exact
+            cell and the search stops once no cheaper meeting is possible, which returns an
+            optimal solution at the cost of many more states
+        deadlock_rules (tuple[str, ...]): keys of _deadlock.RULES applied to forward pushes
+
+    Returns:
+        dict | None: solver result, None if no solution was found
+    """
+    stats = metrics.start(profile)
+
+    codec = StateCodec(grid, stone_weights)
+    dead = _analysis.dead_squares(grid, switches)
+    switch_set = set(switches)
+    deadlocks = _deadlock.DeadlockDetector(grid, switches, deadlock_rules, dead) if deadlock_rules else None
+    # A pulled stone must stay where some stone can be pushed to, or the state is unreachable from the start
+    pushable = set().union(*(_analysis.push_reachable(grid, stone) for stone in stones))
+    start_state = codec.encode(ares_pos, stones)
+
+    forward = _Side(start_state)
+    backward = _Side()
+    # Maps may have floor outside their walls, goal regions are only looked for inside
+    inside = set(_analysis.walk_distances(grid, ares_pos, ()))
+    # There are up to switches! / (switches - stones)! assignments, the budget is checked while they are enumerated
+    stop = (lambda stored: limits.stop_reason(budget, cancel, stats, stored)) if budget or cancel else None
+    goals, stopped = _goal_states(grid, codec, stone_weights, switches, inside, optimal, stop)
+    if stopped:
+        stats.visited = len(goals)
+        stats.stop()
+        return limits.partial_result(stopped, '', [], stats.generated, stats, deadlocks)
+    for goal in goals:
+        backward.add(backward.store.ROOT, ' ', 0, goal)
+
+    best_cost = math.inf
+    meeting = None # (forward node id, backward node id or None when the forward node is a goal)
+    last_forward = forward.store.ROOT
+    if _utils.all_stones_on_switches(stones, switch_set):
+        # Nothing to push: with optimal the start is not a goal, as Ares has not pushed from anywhere
+        best_cost, meeting = 0, (forward.store.ROOT, None)
+
+    while forward.frontier or backward.frontier:
+        if optimal:
+            # Once a side is exhausted every state it reaches has its final cost, so the meeting is final too
+            if not forward.frontier or not backward.frontier or forward.frontier[0][0] + backward.frontier[0][0] >= best_cost:
+                break
+        if len(forward.frontier) + len(backward.frontier) > stats.frontier_peak:
+            stats.frontier_peak = len(forward.frontier) + len(backward.frontier)
+
+        is_forward = not backward.frontier or (forward.frontier and len(forward.frontier) <= len(backward.frontier))
+        side, other = (forward, backward) if is_forward else (backward, forward)
+        total_cost, node = heapq.heappop(side.frontier)
+        if side.best[node.state] != node.node_id:
+            # A cheaper node for the same state was pushed after this one
+            stats.duplicates += 1
+            continue
+
+        ares, stones = codec.decode(node.state)
+        distances = _analysis.walk_distances(grid, ares, stones)
+        if not optimal:
+            region_state = codec.encode(min(distances), stones)
+            if region_state in side.expanded:
+                stats.duplicates += 1
+                continue
+            side.expanded[region_state] = node.node_id
+            if region_state in other.expanded:
+                meeting = (node.node_id, other.expanded[region_state]) if is_forward else (other.expanded[region_state], node.node_id)
+                break
+
+        stats.expanded += 1
+        if (budget or cancel) and stats.expanded % limits.CHECK_INTERVAL == 0:
+            stopped = limits.stop_reason(budget, cancel, stats, len(forward.states) + len(backward.states))
+            if stopped:
+                path, weight_track = _join(grid, codec, stone_weights, forward, backward, last_forward, None)
+                stats.visited = len(forward.best) + len(backward.best)
+                stats.stop()
+                return limits.partial_result(stopped, path, weight_track, stats.generated, stats, deadlocks)
+
+        if is_forward:
+            last_forward = node.node_id
+            if _utils.all_stones_on_switches(stones, switch_set):
+                if total_cost < best_cost:
+                    best_cost, meeting = total_cost, (node.node_id, None)
+                if not optimal:
+                    break
+                continue
+
+        for stone_idx, (stone_x, stone_y) in enumerate(stones):
+            for move, (dx, dy) in _utils.DIRECTIONS.items():
+                if is_forward:
+                    # Push the stone from behind it
+                    if (stone_x - dx, stone_y - dy) not in distances:
+                        continue
+                    target = (stone_x + dx, stone_y + dy)
+                    if grid[target[0]][target[1]] == '#' or target in stones:
+                        continue
+                    new_stones = list(stones)
+                    new_stones[stone_idx] = target
+                    if target in dead or (deadlocks and deadlocks(target, new_stones)):
+                        stats.pruned += 1
+                        continue
+                    new_states = [((stone_x, stone_y), distances[(stone_x - dx, stone_y - dy)])]
+                else:
+                    # Undo a push in direction `move` which left the stone at (stone_x, stone_y):
+                    # Ares stood on `before`, right behind where the stone came from
+                    source = (stone_x - dx, stone_y - dy)
+                    before = (stone_x - 2 * dx, stone_y - 2 * dy)
+                    if optimal:
+                        # The exact state knows which cell Ares pushed from
+                        if source != ares or not _analysis.is_floor(grid, *before) or before in stones:
+                            continue
+                    elif source not in distances or before not in distances:
+                        continue
+                    if source not in pushable:
+                        stats.pruned += 1
+                        continue
+                    new_stones = list(stones)
+                    new_stones[stone_idx] = source
+                    if optimal:
+                        # Any cell walkable to `before` may be where the previous push ended
+                        walk = _analysis.walk_distances(grid, before, new_stones)
+                        new_states = [
+                            (cell, steps) for cell, steps in walk.items()
+                            if _is_after_push(grid, cell, new_stones) or (cell == ares_pos and codec.encode(cell, new_stones) == start_state)
+                        ]
+                    else:
+                        new_states = [(before, 0)]
+
+                for new_ares, steps in new_states:
+                    new_total_cost = total_cost + steps + 1 + stone_weights[stone_idx]
+                    new_state = codec.encode(new_ares, new_stones)
+                    if new_state in side.best and side.cost(new_state) <= new_total_cost:
+                        stats.duplicates += 1
+                        continue
+
+                    node_id = side.add(node.node_id, move.upper(), new_total_cost, new_state)
+                    stats.generated += 1
+                    if progress and stats.generated % _utils.PROGRESS_INTERVAL == 0:
+                        progress(stats.generated)
+
+                    if optimal and new_state in other.best and new_total_cost + other.cost(new_state) < best_cost:
+                        best_cost = new_total_cost + other.cost(new_state)
+                        meeting = (node_id, other.best[new_state]) if is_forward else (other.best[new_state], node_id)
+
+    stats.visited = len(forward.best) + len(backward.best)
+    stats.stop()
+    if meeting is None:
+        return None
+
+    path, weight_track = _join(grid, codec, stone_weights, forward, backward, *meeting)
+    return {
+        'steps': len(path),
+        'weight': weight_track[-1] if weight_track else 0,
+        'nodes': stats.generated,
+        'time_ms': stats.time_ms,
+        'memory_mb': stats.memory_mb,
+        'path': path,
+        'weight_track': weight_track,
+        'deadlocks': deadlocks.hits if deadlocks else {},
+        'metrics': stats.counters()
+    }
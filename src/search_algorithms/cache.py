@@ -0,0 +1,76 @@
+import json
+import time
+import sqlite3
+import hashlib
+
+
+def normalize_map(map_text: str):
+    """Map text without trailing spaces or surrounding blank lines, so equivalent files hash the same"""
+    return '\n'.join(line.rstrip() for line in map_text.strip('\n').splitlines())
+
+
+def cache_key(map_text: str, algorithm: str, version: int, options: dict = None):
+    """Hash of everything a solver result depends on
+
+    Args:
+        map_text (str): map in the input file format
+        algorithm (str): key of runner.ALGORITHMS
+        version (int): runner.SOLVER_VERSION
+        options (dict | None): solver options changing the result, e.g. heuristic
+
+    Returns:
+        str: hex digest
+    """
+    content = json.dumps([normalize_map(map_text), algorithm, version, options or {}], sort_keys=True)
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+class SolutionCache:
+    """Solver results stored in a single SQLite file, evicting the least recently used ones
+
+    Args:
+        path (str): database file, created if missing
+        max_entries (int): results kept, the least recently read or written are dropped beyond it
+    """
+
+    def __init__(self, path: str, max_entries: int = 1000):
+        self.path = path
+        self.max_entries = max_entries
+        self.connection = sqlite3.connect(path, timeout=10)
+        with self.connection:
+            self.connection.execute(
+                'CREATE TABLE IF NOT EXISTS solutions (key TEXT PRIMARY KEY, result TEXT NOT NULL, last_used REAL NOT NULL)'
+            )
+
+    def get(self, key: str):
+        """Cached result for a key, None on a miss"""
+        row = self.connection.execute('SELECT result FROM solutions WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            return None
+        with self.connection:
+            self.connection.execute('UPDATE solutions SET last_used = ? WHERE key = ?', (time.time(), key))
+        return json.loads(row[0])
+
+    def put(self, key: str, result: dict):
+        """Store a finished result
+
+        Partial results of stopped searches are not cached, nor are anytime solutions
+        not proven optimal, which a larger budget may improve.
+        """
+        if result is None or result.get('stopped') or result.get('optimal') is False:
+            return
+        with self.connection:
+            self.connection.execute(
+                'INSERT OR REPLACE INTO solutions (key, result, last_used) VALUES (?, ?, ?)',
+                (key, json.dumps(result), time.time())
+            )
+            self.connection.execute(
+                'DELETE FROM solutions WHERE key IN (SELECT key FROM solutions ORDER BY last_used DESC LIMIT -1 OFFSET ?)',
+                (self.max_entries,)
+            )
+
+    def __len__(self):
+        return self.connection.execute('SELECT COUNT(*) FROM solutions').fetchone()[0]
+
+    def close(self):
+        self.connection.close()
@@ -1,61 +1,6 @@
-import os
-import time
-import tracemalloc
-from . import _utils
+from ._search import search
 
-def dfs(grid, ares_pos, stones, switches, stone_weights):
-    tracemalloc.start()
-    start_time = time.time()
-
-    stack = [(ares_pos, stones, '', 0, [])]
-    visited = dict()
-    visited[(ares_pos[0], ares_pos[1], tuple(stones))] = 0
-    nodes_generated = 0
-
-    while stack:
-        (ares_x, ares_y), stones, path, total_cost, weight_track = stack.pop()
-
-        if _utils.all_stones_on_switches(stones, switches):
-            end_time = time.time()
-            _, peak_memory = tracemalloc.get_traced_memory()
-            tracemalloc.stop()
-
-            return {
-                'steps': len(path),
-                'weight': total_cost,
-                'nodes': nodes_generated,
-                'time_ms': "{:.2f}".format(1000 * (end_time - start_time)),
-                'memory_mb': "{:.2f}".format(peak_memory / 1048576),
-                'path': path,
-                'weight_track': weight_track
-            }
-
-        for move, (dx, dy) in _utils.DIRECTIONS.items():
-            new_x, new_y = ares_x + dx, ares_y + dy
-
-            if grid[new_x][new_y] == '#':
-                continue
-
-            new_stones = stones[:]
-            move_cost = 1
-
-            if (new_x, new_y) in stones:
-                stone_idx = stones.index((new_x, new_y))
-                stone_x, stone_y = new_x + dx, new_y + dy
-
-                if grid[stone_x][stone_y] == '#' or (stone_x, stone_y) in stones:
-                    continue
-
-                new_stones[stone_idx] = (stone_x, stone_y)
-                move_cost += stone_weights[stone_idx]
-
-                move = move.upper()
-
-            new_state = (new_x, new_y, tuple(new_stones))
-            new_cost = total_cost + move_cost
-            if new_state not in visited or new_cost < visited[new_state]:
-                visited[new_state] = new_cost
-                stack.append(((new_x, new_y), new_stones, path + move, new_cost, weight_track + [new_cost]))
-                nodes_generated += 1
-    
-    return None
+def dfs(grid, ares_pos, stones, switches, stone_weights, deadlock_rules=None, progress=None, budget=None, cancel=None, profile='rss'):
+    """Depth-first search: finds some solution, usually far from the shortest or lightest"""
+    return search(grid, ares_pos, stones, switches, stone_weights, 'lifo', deadlock_rules=deadlock_rules,
+                  progress=progress, budget=budget, cancel=cancel, profile=profile)
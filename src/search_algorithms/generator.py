@@ -0,0 +1,149 @@
+import random
+from collections import deque
+from . import _utils, _analysis
+
+# Weight distribution name -> function drawing one weight between low and high (inclusive)
+DISTRIBUTIONS = {
+    'uniform': lambda rng, low, high: rng.randint(low, high),
+    # Mostly light stones with a few heavy ones, like the bundled maps
+    'skewed': lambda rng, low, high: min(high, low + int(rng.expovariate(4 / (high - low + 1)))),
+    'equal': lambda rng, low, high: low,
+}
+
+# A layout is tried again when fewer than this share of the pulls could be applied,
+# or when more than this share of the stones is still on a switch
+MIN_PULL_RATIO = 0.5
+MAX_PLACED_RATIO = 0.5
+
+
+def _carve_floor(height, width, wall_density, rng):
+    """Random walls inside a walled rectangle, keeping only the largest connected floor area"""
+    grid = [['#'] * width for _ in range(height)]
+    for row in range(1, height - 1):
+        for col in range(1, width - 1):
+            if rng.random() >= wall_density:
+                grid[row][col] = ' '
+
+    seen = set()
+    largest = set()
+    for row in range(height):
+        for col in range(width):
+            if grid[row][col] == '#' or (row, col) in seen:
+                continue
+            area = {(row, col)}
+            queue = deque([(row, col)])
+            while queue:
+                x, y = queue.popleft()
+                for dx, dy in _utils.DIRECTIONS.values():
+                    if grid[x + dx][y + dy] != '#' and (x + dx, y + dy) not in area:
+                        area.add((x + dx, y + dy))
+                        queue.append((x + dx, y + dy))
+            seen |= area
+            if len(area) > len(largest):
+                largest = area
+
+    for row in range(height):
+        for col in range(width):
+            if (row, col) not in largest:
+                grid[row][col] = '#'
+    return grid, sorted(largest)
+
+
+def _pull_options(grid, ares, stones):
+    """Pulls Ares can make next, as (stone index, cell the stone moves to, cell Ares moves to)"""
+    reachable = _analysis.walk_distances(grid, ares, stones)
+    options = []
+    for stone_idx, (stone_x, stone_y) in enumerate(stones):
+        for dx, dy in _utils.DIRECTIONS.values():
+            # Ares stands next to the stone and steps back, dragging the stone along
+            stand = (stone_x + dx, stone_y + dy)
+            back = (stone_x + 2 * dx, stone_y + 2 * dy)
+            if stand in reachable and _analysis.is_floor(grid, *back) and back not in stones:
+                options.append((stone_idx, stand, back))
+    return options
+
+
+def _pull_stones(grid, ares, stones, pulls, rng):
+    """Apply random pulls to a solved position, each one the reverse of a legal push
+
+    When Ares gets boxed in, the last pull is undone and another one tried in
+    its place, so the walk does not end in the first pocket it runs into. It
+    gives up after 4 * pulls moves, undos included.
+
+    Returns:
+        (tuple[int, int], list[tuple[int, int]], int): Ares and stones positions after the pulls
+            and the number of pulls applied
+    """
+    stones = list(stones)
+    history = [] # (stone index, stone and Ares positions before the pull, pulls left untried there) per applied pull
+    options = _pull_options(grid, ares, stones)
+    for _ in range(4 * pulls):
+        if len(history) == pulls:
+            break
+        if not options:
+            if not history:
+                break
+            stone_idx, stone, ares, options = history.pop()
+            stones[stone_idx] = stone
+            continue
+        stone_idx, stand, back = options.pop(rng.randrange(len(options)))
+        history.append((stone_idx, stones[stone_idx], ares, options))
+        stones[stone_idx] = stand
+        ares = back
+        options = _pull_options(grid, ares, stones)
+
+    # Walking is free to undo, so Ares can start anywhere in the region it ended in
+    ares = rng.choice(sorted(_analysis.walk_distances(grid, ares, stones)))
+    return ares, stones, len(history)
+
+
+def generate_map(height: int, width: int, stones: int, wall_density: float = 0.2, weights: tuple[int, int] = (1, 99),
+                 distribution: str = 'uniform', pulls: int = None, seed: int = None, attempts: int = 100):
+    """Generate a solvable map in the input file format
+
+    Stones start on their switches and are pulled away from them by Ares, so
+    replaying the pulls backwards as pushes always solves the map.
+
+    Args:
+        height, width (int): grid size including the outer walls
+        stones (int): number of stones (and switches)
+        wall_density (float): chance of an inner cell being a wall before the floor is made connected
+        weights (tuple[int, int]): lowest and highest stone weight
+        distribution (str): key of DISTRIBUTIONS used to draw the weights
+        pulls (int | None): number of random pulls, default stones * (height + width)
+        seed (int | None): random seed, the same arguments and seed give the same map
+        attempts (int): layouts tried before giving up, a layout being rejected when fewer than
+            MIN_PULL_RATIO of the pulls could be applied or more than MAX_PLACED_RATIO of the
+            stones are still on a switch
+
+    Returns:
+        str: weight line followed by the grid, as read by parse_input
+    """
+    rng = random.Random(seed)
+    draw_weight = DISTRIBUTIONS[distribution]
+    pulls = stones * (height + width) if pulls is None else pulls
+
+    for _ in range(attempts):
+        grid, floor = _carve_floor(height, width, wall_density, rng)
+        if len(floor) < 2 * stones + 1:
+            continue
+
+        switches = rng.sample(floor, stones)
+        free = [cell for cell in floor if cell not in switches]
+        ares, pulled, applied = _pull_stones(grid, rng.choice(free), switches, pulls, rng)
+        placed = _utils.count_on_switches(pulled, set(switches))
+        if applied < MIN_PULL_RATIO * pulls or placed > MAX_PLACED_RATIO * stones:
+            continue
+
+        rows = [list(row) for row in grid]
+        for row, col in switches:
+            rows[row][col] = '.'
+        for row, col in pulled:
+            rows[row][col] = '*' if rows[row][col] == '.' else '$'
+        rows[ares[0]][ares[1]] = '+' if rows[ares[0]][ares[1]] == '.' else '@'
+
+        # parse_input assigns weights to stones in row-major order
+        stone_weights = [draw_weight(rng, *weights) for _ in pulled]
+        return ' '.join(map(str, stone_weights)) + '\n' + '\n'.join(''.join(row) for row in rows) + '\n'
+
+    raise ValueError(f'could not generate a {height}x{width} map with {stones} stones, lower wall_density or stones')
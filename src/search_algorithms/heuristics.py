@@ -0,0 +1,333 @@
+import math
+from . import _analysis
+
+try:
+    import numpy as np
+except ImportError: # optional, batches are then scored in pure Python
+    np = None
+
+# Cost given to a stone which cannot reach a switch, large enough to dominate any real cost
+UNREACHABLE = 10 ** 9
+
+# Batches with fewer stones than this in total are matched in pure Python, NumPy's call overhead is not worth it
+NUMPY_MIN_BATCH = 64
+
+
+def heuristic_weighted_manhattan_distance(ares_pos, stones, switches, stone_weights):
+    total_heuristic = 0
+    min_ares_to_stone_dist = -1
+    
+    for i, stone in enumerate(stones):
+        # Calculate the Manhattan distance from Ares to the current stone
+        ares_to_stone_dist = abs(ares_pos[0] - stone[0]) + abs(ares_pos[1] - stone[1])
+        if min_ares_to_stone_dist == -1 or ares_to_stone_dist < min_ares_to_stone_dist:
+            min_ares_to_stone_dist = ares_to_stone_dist
+        
+        # Find the minimum weighted Manhattan distance from the stone to any switch
+        stone_to_switch_dist = min(
+            abs(stone[0] - switch[0]) + abs(stone[1] - switch[1]) for switch in switches
+        )
+        
+        # Compute the heuristic component for this stone
+        total_heuristic += stone_to_switch_dist * (stone_weights[i] + 1)
+    
+    return total_heuristic
+
+
+
+def distance_table(grid, switches):
+    """Manhattan distance from every cell to its nearest switch
+
+    Args:
+        grid (list[list[str]]): map grid returned by find_positions
+        switches (list[tuple[int, int]]): switches positions in (row, col)
+
+    Returns:
+        list[list[int]]: table[row][col] for every cell of the padded grid
+    """
+    width = max(len(row) for row in grid)
+    return [
+        [min((abs(row - switch[0]) + abs(col - switch[1]) for switch in switches), default=UNREACHABLE) for col in range(width)]
+        for row in range(len(grid))
+    ]
+
+
+def _augment(cost, u, v, p, i):
+    # One phase of the Hungarian algorithm: match row i along a shortest augmenting path, 1-indexed
+    m = len(v) - 1
+    p[0] = i
+    j0 = 0
+    minv = [math.inf] * (m + 1)
+    used = [False] * (m + 1)
+    way = [0] * (m + 1)
+    while True:
+        used[j0] = True
+        i0, delta, j1 = p[j0], math.inf, 0
+        row = cost[i0 - 1]
+        for j in range(1, m + 1):
+            if not used[j]:
+                cur = row[j - 1] - u[i0] - v[j]
+                if cur < minv[j]:
+                    minv[j], way[j] = cur, j0
+                if minv[j] < delta:
+                    delta, j1 = minv[j], j
+        for j in range(m + 1):
+            if used[j]:
+                u[p[j]] += delta
+                v[j] -= delta
+            else:
+                minv[j] -= delta
+        j0 = j1
+        if p[j0] == 0:
+            break
+    while j0:
+        j1 = way[j0]
+        p[j0] = p[j1]
+        j0 = j1
+
+
+def solve_assignment(cost: list[list[int]]):
+    """Hungarian algorithm for a rectangular cost matrix
+
+    Args:
+        cost (list[list[int]]): cost[i][j] of giving row i (a stone) column j (a switch), rows <= columns
+
+    Returns:
+        (int, tuple[list[int], list[int], list[int]]): minimum total cost of assigning every row a
+            distinct column, and the matching it was found with: row potentials u, column
+            potentials v and p[j] = row matched to column j, all 1-indexed
+    """
+    n = len(cost)
+    if n == 0:
+        return 0, ([0], [0], [0])
+    m = len(cost[0])
+
+    u = [0] * (n + 1)
+    v = [0] * (m + 1)
+    p = [0] * (m + 1)
+    for i in range(1, n + 1):
+        _augment(cost, u, v, p, i)
+
+    return sum(cost[p[j] - 1][j - 1] for j in range(1, m + 1) if p[j]), (u, v, p)
+
+
+def min_cost_assignment(cost: list[list[int]]):
+    """Minimum total cost of assigning every row of cost a distinct column, see solve_assignment"""
+    return solve_assignment(cost)[0]
+
+
+def repair_assignment(cost: list[list[int]], matching, row: int):
+    """Re-match a single row whose costs changed, starting from an optimal matching
+
+    The row is unmatched and its potential lowered until every reduced cost of
+    the row is non-negative again, then one augmenting phase matches it. The
+    other rows keep their potentials, so this costs O(columns^2) instead of the
+    O(rows * columns^2) of a full solve. The matrix must be square: with spare
+    columns a column freed by the row could keep a potential which no longer
+    fits an unmatched column. Pad it with zero-cost rows.
+
+    Args:
+        cost (list[list[int]]): square cost matrix, only `row` differs from the one matching was found for
+        matching (tuple[list[int], list[int], list[int]]): (u, v, p) from solve_assignment, updated in place
+        row (int): index of the changed row, 0-indexed
+
+    Returns:
+        int: minimum total cost of the new matrix
+    """
+    u, v, p = matching
+    row += 1
+    p[p.index(row, 1)] = 0
+    costs = cost[row - 1]
+    u[row] = min(costs[j - 1] - v[j] for j in range(1, len(v)))
+    _augment(cost, u, v, p, row)
+    return sum(cost[p[j] - 1][j - 1] for j in range(1, len(p)) if p[j])
+
+
+class WeightedManhattan:
+    """Each stone's Manhattan distance to its nearest switch, times (weight + 1)
+
+    The heuristic is a sum of independent per-stone terms, so a push only needs
+    the moved stone's term swapped out. Nearest-switch distances are cached per cell.
+    `batch` scores many configurations from a table of every cell's distance.
+    """
+
+    def __init__(self, grid, switches, stone_weights):
+        self.switches = switches
+        self.stone_weights = stone_weights
+        self.nearest = {}
+        self.table = distance_table(grid, switches)
+        self.factors = [weight + 1 for weight in stone_weights]
+
+    def __call__(self, ares, stones):
+        return heuristic_weighted_manhattan_distance(ares, stones, self.switches, self.stone_weights)
+
+    def term(self, stone_idx, stone):
+        distance = self.nearest.get(stone)
+        if distance is None:
+            distance = min(abs(stone[0] - switch[0]) + abs(stone[1] - switch[1]) for switch in self.switches)
+            self.nearest[stone] = distance
+        return distance * (self.stone_weights[stone_idx] + 1)
+
+    def update(self, parent_h, stone_idx, old, new, stones):
+        """Heuristic of a successor where a single stone moved
+
+        Args:
+            parent_h (int): heuristic value of the parent state
+            stone_idx (int): index of the pushed stone
+            old (tuple[int, int]): position of the stone before the push
+            new (tuple[int, int]): position of the stone after the push
+            stones (tuple[tuple[int, int], ...]): stone positions after the push
+
+        Returns:
+            int: heuristic value of the successor, in O(#switches) at worst
+        """
+        return parent_h - self.term(stone_idx, old) + self.term(stone_idx, new)
+
+    def batch(self, configurations, pushes=None):
+        """Heuristic values of several stone configurations
+
+        Args:
+            configurations (list[tuple[tuple[int, int], ...]]): stone positions of each state
+            pushes (list[tuple] | None): unused, see WeightedAssignment.batch
+
+        Returns:
+            list[int]: heuristic value of each configuration
+        """
+        # Two table lookups per stone, converting the tuples to NumPy arrays would cost more than that
+        table, factors = self.table, self.factors
+        return [sum(table[row][col] * factor for (row, col), factor in zip(stones, factors)) for stones in configurations]
+
+
+class WeightedAssignment:
+    """Minimum-cost stone-to-switch assignment over wall-aware push distances
+
+    Every push of stone i costs at least 1 + stone_weights[i], and each switch
+    takes one stone, so the cheapest matching of stones to distinct switches by
+    push distance * (weight + 1) never overestimates. The push-distance table of
+    every switch is computed once per map.
+
+    The matching depends on every stone, so it is cached per stone configuration
+    (walking and revisits then cost a dict lookup) and each stone's cost row is
+    cached per (cell, weight). The cache is dropped once it holds `cache_size` entries.
+    Configurations scored one at a time also keep their matching, which `update`
+    repairs for the one pushed stone instead of solving the successor from scratch.
+    With NumPy, `batch` gathers the cost matrices of a whole batch in one call.
+    """
+
+    def __init__(self, grid, switches, stone_weights, cache_size=200000):
+        self.stone_weights = stone_weights
+        self.tables = [_analysis.push_distances(grid, switch) for switch in switches]
+        self.cache = {}
+        self.matchings = {} # stone configuration -> (u, v, p) of its square matrix, see repair_assignment
+        self.cache_size = cache_size
+        self.rows = {}
+        self.spare = [0] * len(switches)
+        if np is not None:
+            # costs[switch, row, col]: push distance of a lone stone on (row, col) to the switch, times the stone factor per batch
+            self.costs = np.full((len(switches), len(grid), max(len(row) for row in grid)), UNREACHABLE, dtype=np.int64)
+            for switch_idx, table in enumerate(self.tables):
+                for (row, col), distance in table.items():
+                    self.costs[switch_idx, row, col] = distance
+            self.factors = np.array([weight + 1 for weight in stone_weights], dtype=np.int64)
+
+    def row(self, stone, weight):
+        key = (stone, weight)
+        row = self.rows.get(key)
+        if row is None:
+            row = [table.get(stone, UNREACHABLE) * (weight + 1) for table in self.tables]
+            self.rows[key] = row
+        return row
+
+    def matrix(self, stones):
+        # Square cost matrix, zero-cost rows stand for the switches left without a stone
+        rows = [self.row(stone, weight) for stone, weight in zip(stones, self.stone_weights)]
+        return rows + [self.spare] * (len(self.tables) - len(rows))
+
+    def __call__(self, ares, stones):
+        key = tuple(stones)
+        total = self.cache.get(key)
+        if total is None:
+            if len(stones) > len(self.tables):
+                total = self.store(key, math.inf)
+            else:
+                total = self.store(key, *solve_assignment(self.matrix(stones)))
+        return total
+
+    def store(self, key, total, matching=None):
+        # Cache a matching cost, a stone matched at UNREACHABLE cost makes the state a dead end
+        if total >= UNREACHABLE:
+            total = math.inf
+        if len(self.cache) >= self.cache_size:
+            self.cache.clear()
+            self.matchings.clear()
+        self.cache[key] = total
+        if matching is not None:
+            self.matchings[key] = matching
+        return total
+
+    def batch(self, configurations, pushes=None):
+        """Heuristic values of several stone configurations
+
+        Without NumPy, or for a batch too small to be worth it, the
+        configurations are scored one at a time, repairing the parent's
+        matching (see `update`) for those whose push is given.
+
+        Args:
+            configurations (list[tuple[tuple[int, int], ...]]): stone positions of each state
+            pushes (list[tuple[int, tuple[int, int], tuple[int, int]]] | None): (stone index,
+                old, new position) of the push leading to each configuration
+
+        Returns:
+            list[int | float]: heuristic value of each configuration, inf if some stone can reach no switch
+        """
+        if np is None or len(configurations) * len(self.stone_weights) < NUMPY_MIN_BATCH or len(self.stone_weights) > len(self.tables):
+            if pushes is None:
+                return [self(None, stones) for stones in configurations]
+            return [self.update(None, *pushed, stones) for pushed, stones in zip(pushes, configurations)]
+
+        values = [self.cache.get(tuple(stones)) for stones in configurations]
+        missing = [i for i, value in enumerate(values) if value is None]
+        if missing:
+            positions = np.asarray([configurations[i] for i in missing], dtype=np.intp)
+            # missing x stones x switches cost matrices in one gather
+            matrices = self.costs[:, positions[..., 0], positions[..., 1]].transpose(1, 2, 0) * self.factors[:, None]
+            for i, matrix in zip(missing, matrices):
+                values[i] = self.store(tuple(configurations[i]), min_cost_assignment(matrix.tolist()))
+        return values
+
+    def update(self, parent_h, stone_idx, old, new, stones):
+        """Heuristic of a successor where a single stone moved
+
+        The parent's matching is repaired for the pushed stone's row in
+        O(#switches^2). A parent scored by `batch`, or dropped from the cache,
+        has no matching kept and the successor is solved in full.
+
+        Args:
+            parent_h (int): heuristic value of the parent state, unused as the matching may change
+            stone_idx (int): index of the pushed stone
+            old (tuple[int, int]): position of the stone before the push
+            new (tuple[int, int]): position of the stone after the push
+            stones (tuple[tuple[int, int], ...]): stone positions after the push
+
+        Returns:
+            int | float: heuristic value of the successor, inf if some stone can reach no switch
+        """
+        key = tuple(stones)
+        total = self.cache.get(key)
+        if total is not None:
+            return total
+
+        parent = list(stones)
+        parent[stone_idx] = old
+        matching = self.matchings.get(tuple(parent))
+        if matching is None:
+            return self(None, stones)
+        # The parent's matching may be repaired again for its other successors
+        matching = tuple(list(part) for part in matching)
+        return self.store(key, repair_assignment(self.matrix(stones), matching, stone_idx), matching)
+
+
+HEURISTICS = {
+    'manhattan': WeightedManhattan,
+    'assignment': WeightedAssignment,
+}
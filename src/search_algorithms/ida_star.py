@@ -0,0 +1,155 @@
+import math
+from collections import OrderedDict
+from . import _utils, _analysis, _deadlock, heuristics, limits, metrics
+from ._state import StateCodec
+from ._search import successors
+
+
+class TranspositionTable:
+    """Bounded table of the lowest g each state was reached with in the current iteration
+
+    A state reached again with a g no lower than the stored one is pruned: its
+    subtree was already searched with at least as much budget. With the 'lru'
+    policy the least recently touched entry is evicted; with 'depth' every state
+    hashes to one slot, which keeps whichever of the two states is shallower.
+    """
+
+    def __init__(self, size: int, policy: str = 'lru'):
+        self.size = size
+        self.policy = policy
+        self.clear()
+
+    def clear(self):
+        if self.policy == 'lru':
+            self.entries = OrderedDict()
+        else:
+            self.slots = [None] * self.size
+            self.filled = 0 # occupied slots, counted as they fill so len() is O(1)
+
+    def __len__(self):
+        if self.policy == 'lru':
+            return len(self.entries)
+        return self.filled
+
+    def admit(self, state: int, g: int):
+        """Record a state unless it was already reached as cheaply
+
+        Args:
+            state (int): packed state
+            g (int): cost of the path reaching it
+
+        Returns:
+            bool: False if the state should be pruned
+        """
+        if self.size <= 0:
+            return True
+
+        if self.policy == 'lru':
+            entries = self.entries
+            best = entries.get(state)
+            if best is not None and best <= g:
+                entries.move_to_end(state)
+                return False
+            entries[state] = g
+            entries.move_to_end(state)
+            if len(entries) > self.size:
+                entries.popitem(last=False)
+            return True
+
+        # hash() of an int is the int itself, whose low bits only hold the last stone's cell
+        index = hash((state,)) % self.size
+        slot = self.slots[index]
+        if slot is not None and slot[0] == state and slot[1] <= g:
+            return False
+        if slot is None or slot[0] == state or g <= slot[1]:
+            if slot is None:
+                self.filled += 1
+            self.slots[index] = (state, g)
+        return True
+
+
+def ida_star(grid, ares_pos, stones, switches, stone_weights, heuristic='assignment', deadlock_rules=_deadlock.DEFAULT_RULES, table_size=1000000, table_policy='lru', progress=None, budget=None, cancel=None, profile='rss'):
+    """Iterative-deepening A* on the same cost model as A* (1 + stone weight per push)
+
+    Only the current path, its unexplored siblings and the transposition table
+    are kept in memory, so table_size caps the memory use (0 disables the
+    table). With an admissible heuristic the solution has optimal weight.
+    The table and the stack count as the stored states for budget.max_stored.
+    """
+    stats = metrics.start(profile)
+
+    estimate = heuristics.HEURISTICS[heuristic](grid, switches, stone_weights)
+    codec = StateCodec(grid, stone_weights)
+    dead = _analysis.dead_squares(grid, switches)
+    deadlocks = _deadlock.DeadlockDetector(grid, switches, deadlock_rules, dead) if deadlock_rules else None
+    table = TranspositionTable(table_size, table_policy)
+    start_stones = tuple(stones)
+    switch_set = set(switches)
+
+    init_h = estimate(ares_pos, start_stones)
+    bound = init_h
+    while bound < math.inf:
+        table.clear()
+        next_bound = math.inf
+        path = []
+        weight_track = []
+        stack = [(ares_pos, start_stones, 0, init_h, 0, '', _utils.count_on_switches(start_stones, switch_set))] # ares, stones, g, h, depth, move, placed
+
+        while stack:
+            if len(stack) > stats.frontier_peak:
+                stats.frontier_peak = len(stack)
+            ares, stones, g, h, depth, move, placed = stack.pop()
+            if depth:
+                del path[depth - 1:]
+                del weight_track[depth - 1:]
+                path.append(move)
+                weight_track.append(g)
+
+            if not table.admit(codec.encode(ares, stones), g):
+                stats.duplicates += 1
+                continue
+
+            if placed == len(stones):
+                stats.visited = len(table)
+                stats.stop()
+
+                return {
+                    'steps': len(path),
+                    'weight': g,
+                    'nodes': stats.generated,
+                    'time_ms': stats.time_ms,
+                    'memory_mb': stats.memory_mb,
+                    'path': ''.join(path),
+                    'weight_track': weight_track,
+                    'deadlocks': deadlocks.hits if deadlocks else {},
+                    'metrics': stats.counters()
+                }
+
+            stats.expanded += 1
+            if (budget or cancel) and stats.expanded % limits.CHECK_INTERVAL == 0:
+                stopped = limits.stop_reason(budget, cancel, stats, len(table) + len(stack))
+                if stopped:
+                    stats.visited = len(table)
+                    stats.stop()
+                    return limits.partial_result(stopped, ''.join(path), weight_track, stats.generated, stats, deadlocks)
+            children = []
+            for new_move, new_ares, new_stones, cost, pushed, new_placed in successors(grid, ares, stones, placed, stone_weights, switch_set, dead, deadlocks, stats):
+                new_g = g + cost
+                new_h = estimate.update(h, *pushed, new_stones) if pushed else h
+                if new_g + new_h > bound:
+                    next_bound = min(next_bound, new_g + new_h)
+                    continue
+                children.append((new_g + new_h, new_ares, new_stones, new_g, new_h, new_move, new_placed))
+
+            # Pop the most promising child first
+            children.sort(key=lambda child: child[0], reverse=True)
+            for _, new_ares, new_stones, new_g, new_h, new_move, new_placed in children:
+                stack.append((new_ares, new_stones, new_g, new_h, depth + 1, new_move, new_placed))
+            stats.generated += len(children)
+            if progress and stats.generated // _utils.PROGRESS_INTERVAL != (stats.generated - len(children)) // _utils.PROGRESS_INTERVAL:
+                progress(stats.generated)
+
+        bound = next_bound
+
+    stats.stop()
+    return None
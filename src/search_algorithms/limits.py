@@ -0,0 +1,83 @@
+import threading
+
+# Solvers check their budget and cancellation token every CHECK_INTERVAL expanded nodes,
+# so a run may go past max_expanded by less than that many nodes
+CHECK_INTERVAL = 100
+
+
+class CancelToken:
+    """Flag set from another thread (e.g. the GUI) to stop a running solver"""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+
+class Budget:
+    """Resource limits of a single solver run, None meaning unlimited
+
+    Args:
+        time_limit (float | None): wall time in seconds
+        max_expanded (int | None): number of expanded nodes
+        max_stored (int | None): number of states kept in the solver's tables
+    """
+
+    def __init__(self, time_limit=None, max_expanded=None, max_stored=None):
+        self.time_limit = time_limit
+        self.max_expanded = max_expanded
+        self.max_stored = max_stored
+
+    def exceeded(self, elapsed: float, expanded: int, stored: int):
+        """Name of the first limit reached, None if the run is within budget"""
+        if self.time_limit is not None and elapsed >= self.time_limit:
+            return 'time'
+        if self.max_expanded is not None and expanded >= self.max_expanded:
+            return 'expanded'
+        if self.max_stored is not None and stored >= self.max_stored:
+            return 'stored'
+        return None
+
+
+def stop_reason(budget, cancel, stats, stored: int):
+    """Check why a solver should stop
+
+    Args:
+        budget (Budget | None): limits of the run
+        cancel (CancelToken | None): token of the run
+        stats (Metrics): metrics of the run, for the elapsed time and expanded nodes
+        stored (int): states stored so far
+
+    Returns:
+        str | None: 'cancelled', 'time', 'expanded' or 'stored', None to keep searching
+    """
+    if cancel is not None and cancel.cancelled:
+        return 'cancelled'
+    if budget is not None:
+        return budget.exceeded(stats.elapsed(), stats.expanded, stored)
+    return None
+
+
+def partial_result(reason: str, path: str, weight_track: list[int], nodes: int, stats, deadlocks=None):
+    """Result of a stopped solver, holding the path to the node it was expanding
+
+    Returns:
+        dict: the usual result keys plus 'stopped' set to the stop reason
+    """
+    return {
+        'steps': len(path),
+        'weight': weight_track[-1] if weight_track else 0,
+        'nodes': nodes,
+        'time_ms': stats.time_ms,
+        'memory_mb': stats.memory_mb,
+        'path': path,
+        'weight_track': weight_track,
+        'deadlocks': deadlocks.hits if deadlocks else {},
+        'metrics': stats.counters(),
+        'stopped': reason
+    }
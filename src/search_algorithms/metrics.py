@@ -0,0 +1,150 @@
+import sys
+import time
+import ctypes
+import ctypes.util
+import tracemalloc
+
+try:
+    import resource
+except ImportError: # Windows
+    resource = None
+
+try:
+    _libc = ctypes.CDLL(ctypes.util.find_library('c'))
+    _malloc_trim = _libc.malloc_trim # glibc only
+except (OSError, TypeError, AttributeError):
+    _malloc_trim = None
+
+
+def _reset_peak_rss():
+    """Restart the peak RSS of this process from its current RSS, possible on Linux only"""
+    if _malloc_trim is not None:
+        # Hand memory freed by earlier runs back to the OS, or this run reuses it without raising RSS
+        _malloc_trim(0)
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+    except OSError:
+        pass
+
+
+def _peak_rss():
+    """Peak resident set size of this process in bytes, 0 where it cannot be read"""
+    try:
+        # Unlike ru_maxrss, VmHWM follows _reset_peak_rss
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class Metrics:
+    """Counters of a single solver run, cheap enough to keep on by default
+
+    Solvers update the counters directly in their main loop:
+        expanded: nodes taken off the frontier
+        generated: successors added to the frontier
+        duplicates: successors dropped because their state was already reached as cheaply
+        pruned: successors dropped by dead squares, deadlock rules, region merging or an infinite heuristic
+        frontier_peak: largest frontier (or IDA* stack) size seen
+        visited: size of the table of reached states when the run stopped
+
+    Memory is the peak RSS during the run minus the RSS it started with. On Linux
+    the peak is reset when the run starts; elsewhere it is the process peak, so a
+    run staying below an earlier peak of the same process reports 0 there (the
+    CLI and the benchmark run every job in a fresh process). Runs overlapping in
+    one process, e.g. a cancelled GUI search still returning, share the peak.
+    """
+    __slots__ = ('start_time', 'end_time', 'start_memory', 'end_memory',
+                 'expanded', 'generated', 'duplicates', 'pruned', 'frontier_peak', 'visited')
+
+    def __init__(self):
+        self.start_time = self.end_time = 0.0
+        self.start_memory = self.end_memory = 0
+        self.expanded = 0
+        self.generated = 0
+        self.duplicates = 0
+        self.pruned = 0
+        self.frontier_peak = 0
+        self.visited = 0
+
+    def start(self):
+        _reset_peak_rss()
+        self.start_memory = _peak_rss()
+        self.start_time = time.time()
+        return self
+
+    def checkpoint(self):
+        """Record the time and memory so far without stopping, for results reported mid-run"""
+        self.end_time = time.time()
+        self.end_memory = _peak_rss()
+
+    def stop(self):
+        self.checkpoint()
+
+    def elapsed(self):
+        return time.time() - self.start_time
+
+    @property
+    def peak_memory(self):
+        return self.end_memory - self.start_memory
+
+    @property
+    def time_ms(self):
+        return "{:.2f}".format(1000 * (self.end_time - self.start_time))
+
+    @property
+    def memory_mb(self):
+        return "{:.2f}".format(self.peak_memory / 1048576)
+
+    def counters(self):
+        return {name: getattr(self, name) for name in ('expanded', 'generated', 'duplicates', 'pruned', 'frontier_peak', 'visited')}
+
+
+class TracemallocMetrics(Metrics):
+    """Profiling mode: memory is the peak of Python allocations traced by tracemalloc
+
+    Tracing slows allocation-heavy searches down several times, so time_ms is only
+    comparable between runs using the same mode.
+    """
+    __slots__ = ()
+
+    def start(self):
+        tracemalloc.start()
+        self.start_time = time.time()
+        return self
+
+    def checkpoint(self):
+        self.end_time = time.time()
+        _, self.end_memory = tracemalloc.get_traced_memory()
+
+    def stop(self):
+        self.checkpoint()
+        tracemalloc.stop()
+
+
+# Name accepted by the solvers' profile argument -> metrics class
+METRICS = {
+    'rss': Metrics,
+    'tracemalloc': TracemallocMetrics,
+}
+
+
+def start(profile='rss'):
+    """Start measuring a solver run
+
+    Args:
+        profile (str | Metrics): key of METRICS, or a Metrics instance to fill in
+
+    Returns:
+        Metrics: the started metrics
+    """
+    metrics = METRICS[profile]() if isinstance(profile, str) else profile
+    return metrics.start()
@@ -0,0 +1,140 @@
+import time
+import queue
+import multiprocessing
+from . import limits, metrics
+
+DEFAULT_PORTFOLIO = ('A*', 'A* (assignment)', 'IDA*', 'Push')
+
+# Solvers whose solutions have optimal weight, unless marked 'optimal': False (an anytime search stopped early)
+OPTIMAL_ALGORITHMS = {'UCS', 'A*', 'A* (assignment)', 'IDA*', 'Anytime A*', 'Bidirectional (optimal)'}
+
+
+def _solve_and_report(algorithm, grid, ares_pos, stones, switches, stone_weights, messages, budget, profile):
+    # runner registers this module as the 'Portfolio' solver, so it is imported lazily
+    from . import runner
+
+    start_time = time.time()
+
+    def progress(nodes):
+        messages.put(('progress', algorithm, nodes, time.time() - start_time))
+
+    try:
+        result = runner.solve(algorithm, grid, ares_pos, stones, switches, stone_weights, progress=progress, budget=budget, profile=profile)
+    except Exception as error:
+        messages.put(('failed', algorithm, repr(error), time.time() - start_time))
+        return
+    messages.put(('done', algorithm, result, time.time() - start_time))
+
+
+def portfolio(grid, ares_pos, stones, switches, stone_weights, algorithms=DEFAULT_PORTFOLIO, optimal=False, progress=None, budget=None, cancel=None, profile='rss'):
+    """Race several solvers in separate processes and keep the first answer
+
+    Args:
+        grid, ares_pos, stones, switches, stone_weights: map as returned by parse_input/find_positions
+        algorithms (tuple[str, ...]): names from runner.ALGORITHMS to start
+        optimal (bool): wait for the first solver in OPTIMAL_ALGORITHMS instead of the first
+            solution at all, falling back to the first solution if none of them finds one
+        progress (callable | None): called with the sum of nodes reported by all solvers
+        budget (Budget | None): limits applied to every solver separately
+        cancel (CancelToken | None): checked while waiting, stops all solvers when set
+        profile (str): key of metrics.METRICS used by every solver
+
+    Returns:
+        dict | None: the winning result with 'solver' set to its algorithm name and
+            'portfolio' holding every solver's status, nodes and time so far. If no
+            solver finished, the partial result of the first one stopped by its
+            budget, or an empty partial result when cancelled
+    """
+    stats = metrics.start()
+    # Spawned processes do not inherit the GUI's threads or Qt state
+    context = multiprocessing.get_context('spawn')
+    messages = context.Queue()
+    processes = {
+        algorithm: context.Process(
+            target=_solve_and_report,
+            args=(algorithm, grid, ares_pos, stones, switches, stone_weights, messages, budget, profile),
+            daemon=True
+        )
+        for algorithm in algorithms
+    }
+    report = {algorithm: {'status': 'running', 'nodes': 0, 'time_ms': '0.00'} for algorithm in algorithms}
+    for process in processes.values():
+        process.start()
+
+    winner, fallback, partial = None, None, None
+    cancelled = False
+    running = set(algorithms)
+    try:
+        while running and winner is None:
+            if cancel is not None and cancel.cancelled:
+                cancelled = True
+                break
+            try:
+                kind, algorithm, payload, elapsed = messages.get(timeout=0.5)
+            except queue.Empty:
+                # A solver that died without reporting (e.g. out of memory) is not waited for
+                for algorithm in list(running):
+                    if not processes[algorithm].is_alive() and processes[algorithm].exitcode != 0:
+                        running.discard(algorithm)
+                        report[algorithm]['status'] = 'failed'
+                continue
+
+            entry = report[algorithm]
+            entry['time_ms'] = "{:.2f}".format(1000 * elapsed)
+            if kind == 'progress':
+                entry['nodes'] = payload
+                if progress:
+                    progress(sum(item['nodes'] for item in report.values()))
+                continue
+
+            running.discard(algorithm)
+            if kind == 'failed':
+                entry['status'] = 'failed'
+                entry['error'] = payload
+            elif payload is None:
+                entry['status'] = 'no solution'
+            elif payload.get('stopped'):
+                entry['status'] = 'stopped'
+                entry['stopped'] = payload['stopped']
+                entry['nodes'] = payload['nodes']
+                if partial is None:
+                    partial = (algorithm, payload)
+            else:
+                entry['status'] = 'solved'
+                entry['nodes'] = payload['nodes']
+                entry['weight'] = payload['weight']
+                if not optimal or (algorithm in OPTIMAL_ALGORITHMS and payload.get('optimal', True)):
+                    winner = (algorithm, payload)
+                elif fallback is None:
+                    fallback = (algorithm, payload)
+
+            if optimal and fallback and not running & OPTIMAL_ALGORITHMS:
+                winner = fallback
+    finally:
+        for algorithm, process in processes.items():
+            if process.is_alive():
+                process.terminate()
+                if report[algorithm]['status'] == 'running':
+                    report[algorithm]['status'] = 'cancelled'
+        for process in processes.values():
+            process.join()
+        # Terminated solvers may have left partial messages behind, do not block on flushing them
+        messages.cancel_join_thread()
+        messages.close()
+
+    if winner is None:
+        winner = fallback
+    if winner is None and cancelled:
+        stats.stop()
+        nodes = sum(entry['nodes'] for entry in report.values())
+        winner = (None, limits.partial_result('cancelled', '', [], nodes, stats))
+    if winner is None:
+        winner = partial
+    if winner is None:
+        return None
+
+    algorithm, result = winner
+    result = dict(result)
+    result['solver'] = algorithm
+    result['portfolio'] = report
+    return result
@@ -0,0 +1,7 @@
+from . import _deadlock
+from .push_search import push_search
+
+def push_bitboard(grid, ares_pos, stones, switches, stone_weights, deadlock_rules=_deadlock.DEFAULT_RULES, heuristic=None, progress=None, budget=None, cancel=None, profile='rss'):
+    """push_search on bitboards (see _bitboard.BitboardEngine): same nodes, order and result, cheaper expansions"""
+    return push_search(grid, ares_pos, stones, switches, stone_weights, deadlock_rules=deadlock_rules, heuristic=heuristic, engine='bitboard',
+                       progress=progress, budget=budget, cancel=cancel, profile=profile)
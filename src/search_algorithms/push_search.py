@@ -0,0 +1,191 @@
+import math
+import heapq
+from . import _utils, _analysis, _deadlock, heuristics, limits, metrics
+from ._node_store import NodeStore
+from ._state import StateCodec, Node
+from ._bitboard import BitboardEngine
+
+
+class CellEngine:
+    """Push generation over cell sets, the reference engine of push_search
+
+    An engine looks at a state once per expansion: `region` walks Ares' region
+    and returns its top-left-most cell together with a view of the state which
+    `solved` and `pushes` then read, so the walk is done once per expansion.
+    """
+
+    def __init__(self, grid, switches):
+        self.grid = grid
+        self.switches = set(switches)
+
+    def region(self, ares, stones):
+        """Top-left-most cell of Ares' walkable region and the view of the state"""
+        distances = _analysis.walk_distances(self.grid, ares, stones)
+        return min(distances), (stones, distances)
+
+    def solved(self, view):
+        return _utils.all_stones_on_switches(view[0], self.switches)
+
+    def pushes(self, view):
+        """Legal pushes, dead squares included, as (stone index, move, target, walking steps to the stone)"""
+        stones, distances = view
+        grid = self.grid
+        for stone_idx, (stone_x, stone_y) in enumerate(stones):
+            for move, (dx, dy) in _utils.DIRECTIONS.items():
+                behind = (stone_x - dx, stone_y - dy)
+                if behind not in distances:
+                    continue
+
+                target = (stone_x + dx, stone_y + dy)
+                if grid[target[0]][target[1]] == '#' or target in stones:
+                    continue
+                yield stone_idx, move, target, distances[behind]
+
+
+# Engine name -> class, every engine yields the same pushes in the same order
+ENGINES = {
+    'cells': CellEngine,
+    'bitboard': BitboardEngine,
+}
+
+
+def push_search(grid, ares_pos, stones, switches, stone_weights, deadlock_rules=_deadlock.DEFAULT_RULES, heuristic=None, engine='cells', progress=None, budget=None, cancel=None, profile='rss'):
+    """Uniform-cost search over stone pushes instead of single steps
+
+    A node is a stone configuration plus the region Ares can walk to, keyed by
+    the top-left-most reachable cell. Successors are pushes only, each costing
+    the walk to the stone plus 1 + the stone weight. Nodes are ordered by that
+    walk-plus-push cost, but the first node expanded for a region stands for
+    every cell of it, so a cheaper path through another cell of the region may
+    be lost: the solution is feasible and usually near-optimal, neither
+    weight-optimal nor push-optimal (map 5: 238 against an optimal 236).
+
+    With a heuristic (key of heuristics.HEURISTICS) nodes are ordered by cost
+    plus estimate instead, which finds a solution sooner and with no bound on
+    its weight. All pushes of an expansion are scored with one batch call.
+    `engine` (key of ENGINES) only changes how regions and pushes are computed,
+    never the result.
+    """
+    stats = metrics.start(profile)
+
+    codec = StateCodec(grid, stone_weights)
+    dead = _analysis.dead_squares(grid, switches)
+    engine = ENGINES[engine](grid, switches)
+    estimate = heuristics.HEURISTICS[heuristic](grid, switches, stone_weights) if heuristic else None
+    deadlocks = _deadlock.DeadlockDetector(grid, switches, deadlock_rules, dead) if deadlock_rules else None
+    store = NodeStore()
+    start_state = codec.encode(ares_pos, stones)
+    states = [start_state] # exact state of every stored node, indexed by node id
+    frontier = [(estimate(ares_pos, stones) if estimate else 0, Node(start_state, store.ROOT))] # cost + estimate, node
+
+    generated = {start_state: 0}
+    expanded = set()
+
+    while frontier:
+        if len(frontier) > stats.frontier_peak:
+            stats.frontier_peak = len(frontier)
+        _, node = heapq.heappop(frontier)
+        total_cost = node.g
+        ares, stones = codec.decode(node.state)
+        cell, view = engine.region(ares, stones)
+
+        region_state = codec.encode(cell, stones)
+        if region_state in expanded:
+            stats.duplicates += 1
+            continue
+        expanded.add(region_state)
+        stats.expanded += 1
+        if (budget or cancel) and stats.expanded % limits.CHECK_INTERVAL == 0:
+            stopped = limits.stop_reason(budget, cancel, stats, len(generated))
+            if stopped:
+                path, weight_track = replay_pushes(grid, store, states, codec, stone_weights, node.node_id)
+                stats.visited = len(generated)
+                stats.stop()
+                return limits.partial_result(stopped, path, weight_track, stats.generated, stats, deadlocks)
+
+        if engine.solved(view):
+            path, weight_track = replay_pushes(grid, store, states, codec, stone_weights, node.node_id)
+            stats.visited = len(generated)
+            stats.stop()
+
+            return {
+                'steps': len(path),
+                'weight': total_cost,
+                'nodes': stats.generated,
+                'time_ms': stats.time_ms,
+                'memory_mb': stats.memory_mb,
+                'path': path,
+                'weight_track': weight_track,
+                'deadlocks': deadlocks.hits if deadlocks else {},
+                'metrics': stats.counters()
+            }
+
+        children = []
+        for stone_idx, move, target, steps in engine.pushes(view):
+            new_stones = list(stones)
+            new_stones[stone_idx] = target
+            if target in dead or (deadlocks and deadlocks(target, new_stones)):
+                stats.pruned += 1
+                continue
+
+            new_total_cost = total_cost + steps + 1 + stone_weights[stone_idx]
+            new_state = codec.encode(stones[stone_idx], new_stones)
+
+            if new_state not in generated or new_total_cost < generated[new_state]:
+                children.append((move, new_state, new_total_cost, tuple(new_stones), (stone_idx, stones[stone_idx], target)))
+            else:
+                stats.duplicates += 1
+
+        scores = estimate.batch([child[3] for child in children], [child[4] for child in children]) if estimate else [0] * len(children)
+        for (move, new_state, new_total_cost, _, _), h in zip(children, scores):
+            if h == math.inf:
+                stats.pruned += 1
+                continue
+            generated[new_state] = new_total_cost
+            node_id = store.add(node.node_id, move.upper(), new_total_cost)
+            states.append(new_state)
+            heapq.heappush(frontier, (new_total_cost + h, Node(new_state, node_id, new_total_cost)))
+            stats.generated += 1
+            if progress and stats.generated % _utils.PROGRESS_INTERVAL == 0:
+                progress(stats.generated)
+
+    stats.stop()
+    return None
+
+
+def replay_pushes(grid, store, states, codec, stone_weights, node_id):
+    """Expand a chain of push nodes into the full udlr/UDLR path
+
+    Args:
+        grid (list[list[str]]): map grid returned by find_positions
+        store (NodeStore): arena holding the push nodes
+        states (list[int]): packed state of every node, by node id
+        codec (StateCodec): codec the states were packed with
+        stone_weights (list[int]): stone weights by stone index
+        node_id (int): id of the goal node
+
+    Returns:
+        (str, list[int]): moves from the start and cumulative cost after each move
+    """
+    path = []
+    weight_track = []
+    total_cost = 0
+    ares, stones = codec.decode(states[store.ROOT])
+
+    for child_id in store.lineage(node_id):
+        new_ares, new_stones = codec.decode(states[child_id])
+        push = chr(store.moves[child_id])
+        dx, dy = _utils.DIRECTIONS[push.lower()]
+
+        walk = _analysis.walk_path(grid, ares, (new_ares[0] - dx, new_ares[1] - dy), stones)
+        for move in walk:
+            total_cost += 1
+            path.append(move)
+            weight_track.append(total_cost)
+
+        total_cost += 1 + stone_weights[stones.index(new_ares)]
+        path.append(push)
+        weight_track.append(total_cost)
+        ares, stones = new_ares, new_stones
+
+    return ''.join(path), weight_track
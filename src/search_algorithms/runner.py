@@ -0,0 +1,115 @@
+from . import _utils
+from .cache import cache_key
+from .bfs import bfs
+from .dfs import dfs
+from .ucs import ucs
+from .a_star import a_star
+from .ida_star import ida_star
+from .anytime_a_star import anytime_a_star
+from .push_search import push_search
+from .push_bitboard import push_bitboard
+from .bidirectional import bidirectional
+from .portfolio import portfolio
+
+
+def run_a_star(grid, ares_pos, stones, switches, stone_weights, **options):
+    return a_star(grid, ares_pos, stones, stone_weights, switches, **options)
+
+
+def run_a_star_assignment(grid, ares_pos, stones, switches, stone_weights, **options):
+    return a_star(grid, ares_pos, stones, stone_weights, switches, heuristic='assignment', **options)
+
+
+def run_push_assignment(grid, ares_pos, stones, switches, stone_weights, **options):
+    return push_search(grid, ares_pos, stones, switches, stone_weights, heuristic='assignment', **options)
+
+
+def run_bidirectional_optimal(grid, ares_pos, stones, switches, stone_weights, **options):
+    return bidirectional(grid, ares_pos, stones, switches, stone_weights, optimal=True, **options)
+
+
+# Algorithm name (as shown in the GUI and accepted by the CLI) -> solver taking (grid, ares_pos, stones, switches, stone_weights)
+ALGORITHMS = {
+    'BFS': bfs,
+    'DFS': dfs,
+    'UCS': ucs,
+    'A*': run_a_star,
+    'A* (assignment)': run_a_star_assignment,
+    'IDA*': ida_star,
+    'Anytime A*': anytime_a_star,
+    'Push': push_search,
+    'Push (bitboard)': push_bitboard,
+    'Push (assignment)': run_push_assignment,
+    'Bidirectional': bidirectional,
+    'Bidirectional (optimal)': run_bidirectional_optimal,
+    'Portfolio': portfolio,
+}
+
+# Solvers accepting an on_solution callback, called with every improved solution before the search ends
+ANYTIME_ALGORITHMS = {'Anytime A*'}
+
+# Part of every cache key, bump it when a change to the solvers changes their results
+SOLVER_VERSION = 2
+
+# Solver options which do not change the solution, left out of cache keys
+RUNTIME_OPTIONS = {'progress', 'budget', 'cancel', 'profile', 'on_solution'}
+
+
+def solve(algorithm: str, grid, ares_pos, stones, switches, stone_weights, **options):
+    """Run a solver by name
+
+    Args:
+        algorithm (str): key of ALGORITHMS
+        grid, ares_pos, stones, switches, stone_weights: map as returned by parse_input/find_positions
+        **options: extra keyword arguments forwarded to the solver
+
+    Returns:
+        dict | None: solver result, None if no solution was found
+    """
+    return ALGORITHMS[algorithm](grid, ares_pos, stones, switches, stone_weights, **options)
+
+
+def solve_file(map_file: str, algorithm: str, **options):
+    """Parse a map file and solve it, used as the unit of work by the CLI
+
+    Args:
+        map_file (str): path of an input file (weight line + grid)
+        algorithm (str): key of ALGORITHMS
+        **options: extra keyword arguments forwarded to the solver
+
+    Returns:
+        dict | None: solver result, None if no solution was found
+    """
+    with open(map_file, 'r') as f:
+        input_data = f.read()
+    stone_weights, grid = _utils.parse_input(input_data)
+    ares_pos, stones, switches = _utils.find_positions(grid, stone_weights)
+    return solve(algorithm, grid, ares_pos, stones, switches, stone_weights, **options)
+
+
+def result_key(map_text: str, algorithm: str, **options):
+    """Key of a solver result in a SolutionCache"""
+    options = {name: value for name, value in options.items() if name not in RUNTIME_OPTIONS}
+    return cache_key(map_text, algorithm, SOLVER_VERSION, options)
+
+
+def format_result(result: dict, algorithm: str):
+    """Format a result the way output-NN.txt files store it"""
+    return (
+        f"{algorithm}\n"
+        f"Steps: {result['steps']}, "
+        f"Weight: {result['weight']}, "
+        f"Node: {result['nodes']}, "
+        f"Time (ms): {result['time_ms']}, "
+        f"Memory (MB): {result['memory_mb']}\n"
+        f"{result['path']}\n"
+    )
+
+
+def save_result_to_file(file, result: dict, algorithm: str):
+    """Append a result to an output file opened with 'a+', unless the algorithm is already in it"""
+    file.seek(0)
+    if any(line.rstrip('\n') == algorithm for line in file):
+        return False
+    file.write(format_result(result, algorithm))
+    return True
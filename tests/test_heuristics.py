@@ -0,0 +1,62 @@
+"""Incremental assignment repair against full solves, run from the repository root:
+
+    python -m unittest discover tests
+"""
+import os
+import sys
+import random
+import unittest
+from itertools import permutations
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from search_algorithms import _utils, heuristics  # noqa: E402
+
+MAPS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'maps')
+
+
+def brute_force(cost):
+    return min(sum(cost[i][j] for i, j in enumerate(columns)) for columns in permutations(range(len(cost[0])), len(cost)))
+
+
+class RepairAssignmentTest(unittest.TestCase):
+    def test_chained_repairs_match_full_solves(self):
+        rng = random.Random(0)
+        for _ in range(200):
+            n = rng.randint(1, 6)
+            cost = [[rng.randint(0, 30) for _ in range(n)] for _ in range(n)]
+            _, matching = heuristics.solve_assignment(cost)
+            # Each repair starts from the previous one's matching, as in a chain of pushes
+            for _ in range(5):
+                row = rng.randrange(n)
+                cost[row] = [rng.randint(0, 30) for _ in range(n)]
+                total = heuristics.repair_assignment(cost, matching, row)
+                self.assertEqual(total, heuristics.solve_assignment(cost)[0])
+                self.assertEqual(total, brute_force(cost))
+
+
+class WeightedAssignmentUpdateTest(unittest.TestCase):
+    def test_update_matches_a_fresh_solve(self):
+        rng = random.Random(1)
+        for name in ('input1.txt', 'input5.txt', 'input10.txt'):
+            with open(os.path.join(MAPS_DIR, name)) as f:
+                stone_weights, grid = _utils.parse_input(f.read())
+            _, stones, switches = _utils.find_positions(grid, stone_weights)
+            floor = [(i, j) for i, row in enumerate(grid) for j, cell in enumerate(row) if cell != '#']
+            estimate = heuristics.WeightedAssignment(grid, switches, stone_weights)
+            parent = tuple(stones)
+            estimate(None, parent)
+            for _ in range(300):
+                stone_idx = rng.randrange(len(parent))
+                new = rng.choice([cell for cell in floor if cell not in parent])
+                child = list(parent)
+                child[stone_idx] = new
+                child = tuple(child)
+                value = estimate.update(None, stone_idx, parent[stone_idx], new, child)
+                fresh = heuristics.WeightedAssignment(grid, switches, stone_weights)(None, child)
+                self.assertEqual(value, fresh, f'{name}: {parent} -> {child}')
+                parent = child
+
+
+if __name__ == '__main__':
+    unittest.main()